@@ -0,0 +1,39 @@
+"""
+ABC Oracle font registration and shared rcParams for the chart scripts.
+
+register() is a no-op after the first call, so scripts run from one driver
+process (e.g. ownership_charts.py) parse the OTF files only once, and it skips
+any file the font manager already lists. setup() registers the fonts and
+applies STYLE, the rcParams the charts share.
+"""
+
+import matplotlib.font_manager as fm
+import matplotlib.pyplot as plt
+
+FONT_DIR = "/Users/azizsunderji/Dropbox/Home Economics/Brand Assets/OracleFont/Oracle Aziz Sunderji/Desktop"
+FONT_FILES = ['ABCOracle-Regular.otf', 'ABCOracle-Bold.otf', 'ABCOracle-Light.otf', 'ABCOracle-Medium.otf']
+
+# Oracle as the default family, text kept as <text> in SVGs, and long line
+# paths simplified and drawn in chunks
+STYLE = {'font.family': 'ABC Oracle Edu', 'svg.fonttype': 'none', 'path.simplify': True,
+         'path.simplify_threshold': 1.0, 'agg.path.chunksize': 10000}
+
+_registered = False
+
+
+def register():
+    global _registered
+    if _registered:
+        return
+    known = {f.fname for f in fm.fontManager.ttflist}
+    for f in FONT_FILES:
+        path = f"{FONT_DIR}/{f}"
+        if path not in known:
+            fm.fontManager.addfont(path)
+    _registered = True
+
+
+def setup():
+    """Register the fonts and apply STYLE."""
+    register()
+    plt.rcParams.update(STYLE)
@@ -3,17 +3,15 @@ Unconditional homeownership rate by age: % of ALL people who are
 homeowners (head or spouse in an owned unit).
 """
 
-import duckdb
+from queries import connect, run_all
+import fonts
 import matplotlib
 matplotlib.use('agg')
 import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+import numpy as np
 
 # ── Fonts ──
-FONT_DIR = "/Users/azizsunderji/Dropbox/Home Economics/Brand Assets/OracleFont/Oracle Aziz Sunderji/Desktop"
-for f in ['ABCOracle-Regular.otf', 'ABCOracle-Bold.otf', 'ABCOracle-Light.otf', 'ABCOracle-Medium.otf']:
-    fm.fontManager.addfont(f"{FONT_DIR}/{f}")
-plt.rcParams['font.family'] = 'ABC Oracle Edu'
+fonts.setup()
 
 # ── Colors ──
 BLUE = '#0BB4FF'
@@ -21,73 +19,55 @@ BLACK = '#3D3733'
 BG = '#F6F7F3'
 BOOMER_COLOR = '#BBBFAE'
 
-DATA = '/Users/azizsunderji/Dropbox/Home Economics/Data/CPS_ASEC/cps_asec.parquet'
 OUT = '/Users/azizsunderji/Dropbox/Home Economics/2025_12_29_OwnershipRates/2025_12_29_FirstApproach/outputs'
 
-con = duckdb.connect()
-
-q = """
-WITH persons AS (
-    SELECT *,
-        CASE WHEN (YEAR-AGE) BETWEEN 1946 AND 1964 THEN 'Boomer'
-             WHEN (YEAR-AGE) BETWEEN 1981 AND 1996 THEN 'Millennial' END AS generation,
-        CASE WHEN OWNERSHP = 10 AND RELATE IN (101, 201, 202, 203) THEN 1 ELSE 0 END AS is_owner
-    FROM '{data}'
-    WHERE AGE BETWEEN 20 AND 45
-      AND YEAR != 2014
-      AND ((YEAR-AGE) BETWEEN 1946 AND 1996)
-)
-SELECT generation, AGE,
-    SUM(CASE WHEN is_owner=1 THEN ASECWT ELSE 0 END)/SUM(ASECWT)*100 as ownership_rate
-FROM persons WHERE generation IS NOT NULL
-GROUP BY generation, AGE ORDER BY generation, AGE
-""".format(data=DATA)
-
-df = con.execute(q).df()
+con = connect()
+
+# AGE plus Boomer_rate / Millennial_rate arrays (pivoted in DuckDB)
+res = run_all(con)['overall']
+ages = res['AGE']
 
 for age in [30, 35, 40]:
+    i = np.searchsorted(ages, age)
     for gen in ['Boomer', 'Millennial']:
-        r = df[(df['generation']==gen) & (df['AGE']==age)].iloc[0]
-        print(f"Age {age} {gen}: {r['ownership_rate']:.1f}%")
+        # The pivot has a row per age with any data; a generation missing
+        # there comes back as NaN
+        if i < len(ages) and ages[i] == age and not np.isnan(res[f'{gen}_rate'][i]):
+            print(f"Age {age} {gen}: {res[f'{gen}_rate'][i]:.1f}%")
+        else:
+            print(f"Age {age} {gen}: no data at this age")
 
 # ── Chart ──
-fig, ax = plt.subplots(figsize=(9, 7.5), dpi=100)
+fig, ax = plt.subplots(figsize=(9, 7.5), dpi=150)
 fig.patch.set_facecolor(BG)
 ax.set_facecolor(BG)
 
 for gen, color, label in [('Boomer', BOOMER_COLOR, 'Boomers'), ('Millennial', BLUE, 'Millennials')]:
-    g = df[df['generation'] == gen].sort_values('AGE')
-    ax.plot(g['AGE'], g['ownership_rate'], color=color, linewidth=3.0, label=label, zorder=3)
+    rate = res[f'{gen}_rate']
+    has = ~np.isnan(rate)
+    ax.plot(ages[has], rate[has], color=color, linewidth=3.0, label=label, zorder=3)
 
 for age in [30, 35, 40]:
     ax.axvline(x=age, color=BLACK, linestyle=':', linewidth=0.8, alpha=0.3, zorder=1)
 
-    vals = {}
-    for gen, color in [('Boomer', BOOMER_COLOR), ('Millennial', BLUE)]:
-        row = df[(df['generation'] == gen) & (df['AGE'] == age)]
-        if not row.empty:
-            vals[gen] = row['ownership_rate'].values[0]
-
-    if 'Boomer' in vals and 'Millennial' in vals:
-        gap = vals['Boomer'] - vals['Millennial']
-        if abs(gap) < 6:
-            boomer_offset = 12
-            mill_offset = -18
-        else:
-            boomer_offset = 10
-            mill_offset = -16
-
-        for gen, color, offset_y in [('Boomer', BOOMER_COLOR, boomer_offset),
-                                      ('Millennial', BLUE, mill_offset)]:
-            val = vals[gen]
-            ax.plot(age, val, 'o', color=color, markersize=6, zorder=4,
-                    markeredgecolor='white', markeredgewidth=1.5)
-            ax.annotate(f'{val:.0f}%',
-                        xy=(age, val),
-                        xytext=(4, offset_y),
-                        textcoords='offset points',
-                        fontsize=10, fontweight='bold', color=color,
-                        zorder=5)
+# Markers and labels at 30, 35, 40 for ages where both generations exist
+boomer, mill = res['Boomer_rate'], res['Millennial_rate']
+key = np.isin(ages, [30, 35, 40]) & ~np.isnan(boomer) & ~np.isnan(mill)
+close = np.abs(boomer[key] - mill[key]) < 6
+n = key.sum()
+xs = np.concatenate([ages[key], ages[key]])
+ys = np.concatenate([boomer[key], mill[key]])
+cs = [BOOMER_COLOR] * n + [BLUE] * n
+offsets = np.concatenate([np.where(close, 12, 10), np.where(close, -18, -16)])
+
+ax.scatter(xs, ys, c=cs, s=36, edgecolors='white', linewidths=1.5, zorder=4)
+for x, val, color, offset_y in zip(xs, ys, cs, offsets):
+    ax.annotate(f'{val:.0f}%',
+                xy=(x, val),
+                xytext=(4, offset_y),
+                textcoords='offset points',
+                fontsize=10, fontweight='bold', color=color,
+                zorder=5)
 
 ymin, ymax = ax.get_ylim()
 ax.set_ylim(0, min(80, ymax + 5))
@@ -125,10 +105,10 @@ ax.legend(fontsize=11, loc='lower right', frameon=False,
 fig.text(0.1, 0.01, 'Source: CPS ASEC via IPUMS (1976\u20132025, excluding 2014)',
          fontsize=8, color=BLACK, alpha=0.5, style='italic')
 
-plt.tight_layout(rect=[0, 0.03, 1, 0.95])
+# Fixed margins (tuned once) instead of a tight_layout / tight-bbox pass
+fig.subplots_adjust(left=0.07, right=0.97, top=0.86, bottom=0.11)
 
-fig.savefig(f'{OUT}/ownership_rate_all_by_age.png', dpi=150, bbox_inches='tight', facecolor=BG)
-plt.rcParams['svg.fonttype'] = 'none'
-fig.savefig(f'{OUT}/ownership_rate_all_by_age.svg', bbox_inches='tight', facecolor=BG)
+fig.savefig(f'{OUT}/ownership_rate_all_by_age.png', dpi=150, bbox_inches=None, facecolor=BG)
+fig.savefig(f'{OUT}/ownership_rate_all_by_age.svg', bbox_inches=None, facecolor=BG)
 plt.close()
 print("Saved ownership_rate_all_by_age")
@@ -0,0 +1,14 @@
+"""
+Driver: render the three ownership-by-age charts in one process.
+
+queries.run_all keeps its results for the life of the process, so the CPS ASEC
+parquet is scanned once here instead of once per chart script.
+"""
+
+import os
+import runpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+for script in ['overall_ownership_chart.py', 'option2_stacked_area.py', 'option3_gap_chart.py']:
+    runpy.run_path(os.path.join(HERE, script), run_name='__main__')
@@ -0,0 +1,268 @@
+"""
+Shared CPS ASEC aggregations for the ownership-by-age charts.
+
+The parquet file is scanned once into a `persons_filtered` table persisted in
+.cache/cps_view.duckdb (generation and head/married/owner flags derived
+there), and every chart-level aggregation runs against that table instead of
+re-reading the parquet. Only the six columns the charts use are read, and the
+age/year/cohort filters sit directly on the scan so DuckDB can prune row
+groups from the parquet statistics.
+Weights are stored as FLOAT (summed in double), and the share columns use
+`SUM(ASECWT) FILTER (WHERE ...)` so non-matching rows never reach the sum.
+The parquet path is bound as a parameter (`read_parquet(?)`) rather than
+formatted into the SQL, so the statement text, and with it the cache keys, do
+not change with where the data lives.
+"""
+
+import hashlib
+import os
+
+import duckdb
+import numpy as np
+
+DATA = '/Users/azizsunderji/Dropbox/Home Economics/Data/CPS_ASEC/cps_asec.parquet'
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+VIEW_DB = os.path.join(CACHE_DIR, 'cps_view.duckdb')
+
+PERSONS = """
+CREATE OR REPLACE TABLE c.persons_filtered AS
+SELECT AGE, YEAR, RELATE, MARST, OWNERSHP, ASECWT::FLOAT AS ASECWT,
+    CASE WHEN (YEAR-AGE) BETWEEN 1946 AND 1964 THEN 'Boomer'
+         WHEN (YEAR-AGE) BETWEEN 1981 AND 1996 THEN 'Millennial' END AS generation,
+    (RELATE IN (101, 201, 202, 203)) AS is_head,
+    (MARST IN (1, 2) OR RELATE IN (201, 202, 203)) AS is_married,
+    (OWNERSHP = 10) AS is_owner
+FROM read_parquet(?)
+WHERE AGE BETWEEN 20 AND 45
+  AND YEAR != 2014
+  AND ((YEAR-AGE) BETWEEN 1946 AND 1996)
+  AND ((YEAR-AGE) NOT BETWEEN 1965 AND 1980)
+"""
+
+# Stacked-area breakdown: five household/tenure shares summing to 100,
+# one row per AGE with Boomer_<share> / Millennial_<share> columns
+STACKED = """
+SELECT * FROM (
+PIVOT (
+    SELECT generation, AGE,
+        -- 1. Married heads who own
+        COALESCE(SUM(ASECWT) FILTER (WHERE is_head AND is_married AND is_owner), 0)/SUM(ASECWT)*100
+            AS married_owner,
+        -- 2. Married heads who rent
+        COALESCE(SUM(ASECWT) FILTER (WHERE is_head AND is_married AND NOT is_owner), 0)/SUM(ASECWT)*100
+            AS married_renter,
+        -- 3. Single heads who own
+        COALESCE(SUM(ASECWT) FILTER (WHERE is_head AND NOT is_married AND is_owner), 0)/SUM(ASECWT)*100
+            AS single_owner,
+        -- 4. Single heads who rent
+        COALESCE(SUM(ASECWT) FILTER (WHERE is_head AND NOT is_married AND NOT is_owner), 0)/SUM(ASECWT)*100
+            AS single_renter,
+        -- 5. Non-heads
+        COALESCE(SUM(ASECWT) FILTER (WHERE NOT is_head), 0)/SUM(ASECWT)*100
+            AS non_head
+    FROM persons WHERE generation IS NOT NULL
+    GROUP BY generation, AGE
+) ON generation IN ('Boomer', 'Millennial')
+USING FIRST(married_owner) AS married_owner, FIRST(married_renter) AS married_renter,
+      FIRST(single_owner) AS single_owner, FIRST(single_renter) AS single_renter,
+      FIRST(non_head) AS non_head
+GROUP BY AGE
+) ORDER BY AGE
+"""
+
+# Gap metrics: Boomer minus Millennial, per age, for overall ownership,
+# married-head share and ownership among married heads. Ages missing either
+# generation drop out via the NULL difference.
+GAP = """
+WITH rates AS (
+    SELECT generation, AGE,
+        -- Overall ownership (head/spouse in owned unit)
+        COALESCE(SUM(ASECWT) FILTER (WHERE is_head AND is_owner), 0)/SUM(ASECWT)*100
+            AS overall_ownership,
+        -- Married head rate (of all people)
+        COALESCE(SUM(ASECWT) FILTER (WHERE is_head AND is_married), 0)/SUM(ASECWT)*100
+            AS married_head_rate,
+        -- Ownership among married heads
+        COALESCE(SUM(ASECWT) FILTER (WHERE is_head AND is_married AND is_owner), 0) /
+            NULLIF(SUM(ASECWT) FILTER (WHERE is_head AND is_married), 0) * 100
+            AS ownership_married_heads
+    FROM persons WHERE generation IS NOT NULL
+    GROUP BY generation, AGE
+), gaps AS (
+    SELECT AGE,
+        MAX(CASE WHEN generation = 'Boomer' THEN overall_ownership END)
+          - MAX(CASE WHEN generation = 'Millennial' THEN overall_ownership END)
+            AS "Overall ownership gap",
+        MAX(CASE WHEN generation = 'Boomer' THEN married_head_rate END)
+          - MAX(CASE WHEN generation = 'Millennial' THEN married_head_rate END)
+            AS "Married head share gap",
+        MAX(CASE WHEN generation = 'Boomer' THEN ownership_married_heads END)
+          - MAX(CASE WHEN generation = 'Millennial' THEN ownership_married_heads END)
+            AS "Ownership | married heads gap"
+    FROM rates
+    GROUP BY AGE
+)
+SELECT * FROM gaps WHERE "Overall ownership gap" IS NOT NULL ORDER BY AGE
+"""
+
+# Unconditional ownership: % of all people who are head/spouse in an owned unit,
+# one row per AGE with Boomer_rate / Millennial_rate columns
+OVERALL = """
+SELECT * FROM (
+PIVOT (
+    SELECT generation, AGE,
+        COALESCE(SUM(ASECWT) FILTER (WHERE is_head AND is_owner), 0)/SUM(ASECWT)*100 AS ownership_rate
+    FROM persons WHERE generation IS NOT NULL
+    GROUP BY generation, AGE
+) ON generation IN ('Boomer', 'Millennial') USING FIRST(ownership_rate) AS rate
+GROUP BY AGE
+) ORDER BY AGE
+"""
+
+# (head, married, owner) weight cube per generation and age: at most eight
+# cells per (generation, AGE). The Sankey flow totals (sankey_flows, used by
+# every Sankey script) and the time-series rates
+# (sankey_requery_and_timeseries) are all sums over these cells, so they all
+# share this one query and its cache entry.
+CELLS = """
+SELECT generation, AGE, is_head, is_married, is_owner, SUM(ASECWT) AS w
+FROM persons
+WHERE generation IS NOT NULL
+GROUP BY ALL
+"""
+
+QUERIES = {'stacked': STACKED, 'gap': GAP, 'overall': OVERALL}
+
+_results = {}
+
+
+def connect():
+    """In-memory DuckDB connection tuned for the persons scan.
+
+    Uses every core, keeps parquet metadata in the object cache between
+    queries, and turns off the progress bar.
+    """
+    con = duckdb.connect()
+    con.execute(f"SET threads = {os.cpu_count()}")
+    con.execute("SET enable_object_cache = true")
+    con.execute("SET enable_progress_bar = false")
+    return con
+
+
+def attach_persons(con):
+    """Expose the filtered persons set on `con` as `persons`.
+
+    The filtered rows live in a persistent `persons_filtered` table in
+    VIEW_DB, so later sessions skip the parquet scan and WHERE pass entirely.
+    It is rebuilt when the parquet mtime or the PERSONS definition changes.
+
+    A current VIEW_DB is attached READ_ONLY, so several scripts can read it at
+    once; only a rebuild opens it read-write. If another process holds the
+    file lock at that point, this session builds its table in memory instead.
+    """
+    if con.execute("SELECT 1 FROM duckdb_databases() WHERE database_name = 'c'").fetchone():
+        return
+    stamp = hashlib.sha1(PERSONS.encode() + str(os.path.getmtime(DATA)).encode()).hexdigest()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        con.execute(f"ATTACH '{VIEW_DB}' AS c (READ_ONLY)")
+        current = con.execute("SELECT stamp FROM c.source").fetchone() == (stamp,)
+    except duckdb.Error:
+        # Missing or empty file, or another process is writing it
+        current = False
+    if not current:
+        con.execute("DETACH DATABASE IF EXISTS c")
+        try:
+            con.execute(f"ATTACH '{VIEW_DB}' AS c")
+        except duckdb.IOException:
+            con.execute("ATTACH ':memory:' AS c")
+        con.execute("CREATE TABLE IF NOT EXISTS c.source (stamp VARCHAR)")
+        con.execute(PERSONS, [DATA])
+        con.execute("DELETE FROM c.source")
+        con.execute("INSERT INTO c.source VALUES (?)", [stamp])
+    con.execute("CREATE OR REPLACE TEMP VIEW persons AS SELECT * FROM c.persons_filtered")
+
+
+def cached_query(con, sql, cache_path=CACHE_DIR):
+    """Run `sql` against the persons table, memoized on disk as .npz.
+
+    Results are a dict of column name -> NumPy array (via fetchnumpy, no
+    pandas frame in between).
+
+    The cache key is the SQL text (including the persons definition) plus the
+    parquet mtime, so editing a query or refreshing the data invalidates it.
+    On a hit the parquet is never touched.
+    """
+    h = hashlib.sha1((PERSONS + sql).encode() + str(os.path.getmtime(DATA)).encode()).hexdigest()
+    path = os.path.join(cache_path, f'{h}.npz')
+    if os.path.exists(path):
+        with np.load(path) as z:
+            return {k: z[k] for k in z.files}
+    attach_persons(con)
+    # NULLs come back masked; store them as NaN so the cache round-trips.
+    # A NULL flag (is_head etc.) becomes False instead, keeping the column
+    # bool so `~h` / `h & m` still work on it.
+    # Strings come back as object arrays, which np.load would refuse without
+    # pickling, so they are stored as fixed-width unicode instead.
+    res = {}
+    for k, v in con.execute(sql).fetchnumpy().items():
+        if v.dtype == object:
+            res[k] = np.asarray(v, dtype=str)
+        elif np.ma.isMaskedArray(v) and v.dtype == bool:
+            res[k] = np.ma.filled(v, False)
+        elif np.ma.isMaskedArray(v):
+            res[k] = np.ma.filled(v.astype(float), np.nan)
+        else:
+            res[k] = v
+    os.makedirs(cache_path, exist_ok=True)
+    np.savez(path, **res)
+    return res
+
+
+def run_all(con):
+    """Return all three result sets keyed by name, scanning the parquet at most once.
+
+    Results are kept for the life of the process, so when the chart scripts
+    are run from one driver only the first one pays for the scan (or the
+    cache read).
+    """
+    for name, q in QUERIES.items():
+        if name not in _results:
+            _results[name] = cached_query(con, q)
+    return {name: _results[name] for name in QUERIES}
+
+
+def flag_cells(con):
+    """Return the CELLS cube, cached on disk and kept for the life of the process."""
+    if 'cells' not in _results:
+        _results['cells'] = cached_query(con, CELLS)
+    return _results['cells']
+
+
+def sankey_flows(con, ages):
+    """Sankey flow totals at each age in `ages`, as {age: {generation: {...}}}.
+
+    Values are weighted person counts (total_pop, heads, not_heads,
+    married_heads, single_heads and the four married/single owner/renter
+    outcomes), summed from flag_cells.
+    """
+    c = flag_cells(con)
+    keep = np.isin(c['AGE'], ages)
+    h, m, o, w = (c[k][keep] for k in ('is_head', 'is_married', 'is_owner', 'w'))
+    parts = {
+        'total_pop': w,
+        'heads': w * h,
+        'not_heads': w * ~h,
+        'married_heads': w * (h & m),
+        'single_heads': w * (h & ~m),
+        'married_owner': w * (h & m & o),
+        'married_renter': w * (h & m & ~o),
+        'single_owner': w * (h & ~m & o),
+        'single_renter': w * (h & ~m & ~o),
+    }
+    data = {}
+    for i, (age, gen) in enumerate(zip(c['AGE'][keep].tolist(), c['generation'][keep].tolist())):
+        row = data.setdefault(age, {}).setdefault(gen, dict.fromkeys(parts, 0.0))
+        for k, v in parts.items():
+            row[k] += float(v[i])
+    return data
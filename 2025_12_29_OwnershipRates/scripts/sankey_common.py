@@ -0,0 +1,121 @@
+"""
+Shared setup and drawing helpers for the overlaid Sankey charts.
+
+Importing this module configures the backend, fonts and rcParams once per
+process, so running several versions together (see sankey_overlaid_v2_v3.py)
+does not repeat that work.
+"""
+
+import gzip
+
+import numpy as np
+import matplotlib
+matplotlib.use('agg')
+import matplotlib.pyplot as plt
+from queries import connect, sankey_flows
+import fonts
+
+# ── Fonts ──
+fonts.setup()
+plt.rcParams['svg.hashsalt'] = 'sankey'
+
+# ── Colors ──
+BLUE = '#0BB4FF'
+CREAM = '#DADFCE'
+BG = '#F6F7F3'
+BLACK = '#3D3733'
+
+OUT = '/Users/azizsunderji/Dropbox/Home Economics/2025_12_29_OwnershipRates/2025_12_29_FirstApproach/outputs'
+
+AGES = [30, 35, 40]
+
+# Outcome segments at the last stage, top to bottom
+SEG_KEYS = ('m_own', 'm_rent', 's_own', 's_rent')
+
+
+def get_data(ages):
+    """Get flow percentages for both generations at each age.
+
+    The totals come from queries.sankey_flows, summed over the shared,
+    disk-cached flag_cells cube, and are turned into shares of each
+    generation's population here.
+    Returns {age: {'Boomer': {...}, 'Millennial': {...}}}.
+    """
+    with connect() as con:
+        flows = sankey_flows(con, ages)
+    per_age = {}
+    for age, gens in flows.items():
+        for gen, f in gens.items():
+            total = f['total_pop']
+            per_age.setdefault(age, {})[gen] = {
+                'heads': f['heads'] / total * 100,
+                'not_heads': f['not_heads'] / total * 100,
+                'married': f['married_heads'] / total * 100,
+                'single': f['single_heads'] / total * 100,
+                'm_own': f['married_owner'] / total * 100,
+                'm_rent': f['married_renter'] / total * 100,
+                's_own': f['single_owner'] / total * 100,
+                's_rent': f['single_renter'] / total * 100,
+            }
+    return per_age
+
+
+def straight_flow(polys, x0, x1, y0_top, y0_bot, y1_top, y1_bot):
+    """Append a flow with straight edges to `polys`; empty or inverted ends are skipped.
+
+    Easing x and y by the same in-out curve still traces a straight line, so
+    the four corners describe such a flow exactly; sampling the curve only
+    adds collinear vertices.
+    """
+    if y0_top <= y0_bot or y1_top <= y1_bot:
+        return
+    # Top edge left to right, then bottom edge back
+    polys.append([(x0, y0_top), (x1, y1_top), (x1, y1_bot), (x0, y0_bot)])
+
+
+def bar(polys, x, w, y_top, y_bot):
+    """Append a vertical bar to `polys`; empty or inverted spans are skipped."""
+    if y_top <= y_bot:
+        return
+    x_l, x_r = x - w/2, x + w/2
+    polys.append(np.array([(x_l, y_bot), (x_r, y_bot), (x_r, y_top), (x_l, y_top)]))
+
+
+_canvases = {}
+
+
+def canvas(draw_static=None, figsize=(11, 10)):
+    """This process's figure and main axes for `draw_static`, created on first use.
+
+    Age-independent labels live on an overlay axes with the same position
+    and limits, drawn once; each render only clears the main axes. Keyed by
+    `draw_static` and `figsize` so v2 and v3 jobs sharing a worker keep
+    separate figures. Without `draw_static` there is no overlay and the main
+    axes hold it all.
+    """
+    key = draw_static, figsize
+    if key not in _canvases:
+        fig, ax = plt.subplots(figsize=figsize, dpi=100)
+        fig.patch.set_facecolor(BG)
+        if draw_static is not None:
+            draw_static(fig.add_axes(ax.get_position(), label='static'))
+        _canvases[key] = fig, ax
+    return _canvases[key]
+
+
+def save(fig, name, compress=False):
+    """Write `fig` to OUT as `name`.png and `name`.svg (`name`.svgz if `compress`)."""
+    # Measure the tight bbox once and reuse it for both saves, instead of
+    # letting each savefig run its own layout pass
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.1)
+    fig.savefig(f'{OUT}/{name}.png', dpi=150, bbox_inches=bbox, facecolor=BG)
+    # No timestamp and a fixed id salt: re-running on unchanged data writes
+    # byte-identical SVGs, so there is nothing to re-sync
+    if not compress:
+        fig.savefig(f'{OUT}/{name}.svg', bbox_inches=bbox, facecolor=BG, metadata={'Date': None})
+        return
+    # Gzipped SVG is a fraction of the size for Dropbox to sync. matplotlib's
+    # own .svgz path stamps the time into the gzip header, so the file is
+    # opened here with mtime=0 to keep re-runs byte-identical
+    with gzip.GzipFile(f'{OUT}/{name}.svgz', 'wb', mtime=0) as gz:
+        fig.savefig(gz, format='svg', bbox_inches=bbox, facecolor=BG, metadata={'Date': None})
@@ -8,20 +8,25 @@ Flow structure:
        → BUY HOME / RENT
 """
 
-import duckdb
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import matplotlib
 matplotlib.use('agg')
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+import matplotlib.colors as mcolors
 from matplotlib.path import Path
 import matplotlib.font_manager as fm
+from queries import connect, sankey_flows
+from sankey_common import canvas, save
 
-# ── Fonts ──
-FONT_DIR = "/Users/azizsunderji/Dropbox/Home Economics/Brand Assets/OracleFont/Oracle Aziz Sunderji/Desktop"
-for f in ['ABCOracle-Regular.otf', 'ABCOracle-Bold.otf', 'ABCOracle-Light.otf', 'ABCOracle-Medium.otf']:
-    fm.fontManager.addfont(f"{FONT_DIR}/{f}")
-plt.rcParams['font.family'] = 'ABC Oracle Edu'
+# ── Fonts (registered and styled by sankey_common at import) ──
+plt.rcParams['text.hinting'] = 'none'
+LABEL_FP = fm.FontProperties(family='ABC Oracle Edu', weight='bold', size=10)
+STAGE_FP = fm.FontProperties(family='ABC Oracle Edu', weight='bold', size=9)
+LEGEND_FP = fm.FontProperties(family='ABC Oracle Edu', size=10)
+SOURCE_FP = fm.FontProperties(family='ABC Oracle Edu', style='italic', size=9)
 
 # ── Colors ──
 BLUE = '#0BB4FF'
@@ -31,88 +36,98 @@ CREAM_DARK = '#C5C9B8'
 BG = '#F6F7F3'
 BLACK = '#3D3733'
 
-DATA = '/Users/azizsunderji/Dropbox/Home Economics/Data/CPS_ASEC/cps_asec.parquet'
-OUT = '/Users/azizsunderji/Dropbox/Home Economics/2025_12_29_OwnershipRates/2025_12_29_FirstApproach/outputs'
-
-con = duckdb.connect()
-
-
-def get_data(age):
-    """Get flow percentages for both generations at a given age."""
-    q = f"""
-    WITH persons AS (
-        SELECT *,
-            CASE WHEN (YEAR-AGE) BETWEEN 1946 AND 1964 THEN 'Boomer'
-                 WHEN (YEAR-AGE) BETWEEN 1981 AND 1996 THEN 'Millennial' END AS generation,
-            CASE WHEN RELATE IN (101, 201, 202, 203) THEN 1 ELSE 0 END AS is_head,
-            CASE WHEN MARST IN (1, 2) OR RELATE IN (201, 202, 203) THEN 1 ELSE 0 END AS is_married,
-            CASE WHEN OWNERSHP = 10 THEN 1 ELSE 0 END AS is_owner
-        FROM '{DATA}'
-        WHERE AGE = {age} AND YEAR != 2014
-          AND ((YEAR-AGE) BETWEEN 1946 AND 1996)
-    )
-    SELECT
-        generation,
-        SUM(ASECWT) AS total_pop,
-        SUM(CASE WHEN is_head=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS heads,
-        SUM(CASE WHEN is_head=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS not_heads,
-        SUM(CASE WHEN is_head=1 AND is_married=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS married,
-        SUM(CASE WHEN is_head=1 AND is_married=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS single,
-        SUM(CASE WHEN is_head=1 AND is_married=1 AND is_owner=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS married_owner,
-        SUM(CASE WHEN is_head=1 AND is_married=1 AND is_owner=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS married_renter,
-        SUM(CASE WHEN is_head=1 AND is_married=0 AND is_owner=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS single_owner,
-        SUM(CASE WHEN is_head=1 AND is_married=0 AND is_owner=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS single_renter
-    FROM persons WHERE generation IS NOT NULL
-    GROUP BY generation ORDER BY generation
-    """
-    df = con.execute(q).df()
-    return {
-        'Boomer': df[df['generation'] == 'Boomer'].iloc[0].to_dict(),
-        'Millennial': df[df['generation'] == 'Millennial'].iloc[0].to_dict()
-    }
+# Boomer cream at 55% over the background, blended once: the Boomer layer is
+# the bottom one and only ever sits on BG, so drawing it opaque in this color
+# matches alpha compositing pixel for pixel without the per-pixel blend
+BOOMER_ALPHA = 0.55
+CREAM_PREMUL = tuple(bg * (1 - BOOMER_ALPHA) + cd * BOOMER_ALPHA
+                     for bg, cd in zip(mcolors.to_rgb(BG), mcolors.to_rgb(CREAM_DARK)))
+
+AGES = [30, 35, 40]
+
+# Outcome segments, top to bottom, and their keys in calc_positions' output
+SEG_KEYS = ('married_owner', 'married_renter', 'single_owner', 'single_renter', 'not_heads')
+SEG_POS = ('m_own', 'm_rent', 's_own', 's_rent', 'nh_rent')
+
+# Labels that don't depend on the data: (x, y, text, kwargs), drawn as-is for
+# every age with the shared FontProperties above
+STATIC_TEXTS = [
+    (0.05, -5, 'BIRTH', dict(ha='center', va='top', fontproperties=LABEL_FP)),
+    (0.10, 109.5, 'Boomers', dict(va='center', fontproperties=LEGEND_FP)),
+    (0.10, 104.5, 'Millennials', dict(va='center', fontproperties=LEGEND_FP)),
+    (0.02, -10, 'Source: CPS ASEC via IPUMS', dict(fontproperties=SOURCE_FP, alpha=0.6)),
+]
+
 
+def get_data(con, ages):
+    """Get flow percentages for both generations at each age.
 
-def draw_flow(ax, x0, y0_start, y0_end, x1, y1_start, y1_end, color, alpha=1.0, zorder=1):
-    """Draw a curved flow between two vertical segments."""
+    The totals come from queries.sankey_flows, summed over the flag_cells
+    cube shared (and cached on disk) with the other Sankey charts, and are
+    turned into shares of each generation's population here.
+    Returns {age: {'Boomer': {...}, 'Millennial': {...}}}.
+    """
+    per_age = {}
+    for age, gens in sankey_flows(con, ages).items():
+        for gen, f in gens.items():
+            total = f['total_pop']
+            per_age.setdefault(age, {})[gen] = {
+                'heads': f['heads'] / total * 100,
+                'not_heads': f['not_heads'] / total * 100,
+                'married': f['married_heads'] / total * 100,
+                'single': f['single_heads'] / total * 100,
+                'married_owner': f['married_owner'] / total * 100,
+                'married_renter': f['married_renter'] / total * 100,
+                'single_owner': f['single_owner'] / total * 100,
+                'single_renter': f['single_renter'] / total * 100,
+            }
+    return per_age
+
+
+# Path codes shared by every flow / bar
+_FLOW_CODES = np.array([Path.MOVETO,
+                        Path.CURVE4, Path.CURVE4, Path.CURVE4,
+                        Path.LINETO,
+                        Path.CURVE4, Path.CURVE4, Path.CURVE4,
+                        Path.CLOSEPOLY], dtype=np.uint8)
+_BAR_CODES = np.array([Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO,
+                       Path.CLOSEPOLY], dtype=np.uint8)
+
+
+def draw_flow(paths, x0, y0_start, y0_end, x1, y1_start, y1_end):
+    """Append a curved flow between two vertical segments to `paths`."""
     # Control points for bezier curve
     cx = (x0 + x1) / 2
 
-    verts = [
-        (x0, y0_start),  # start top
-        (cx, y0_start),  # control 1
-        (cx, y1_start),  # control 2
-        (x1, y1_start),  # end top
-        (x1, y1_end),    # end bottom
-        (cx, y1_end),    # control 3
-        (cx, y0_end),    # control 4
-        (x0, y0_end),    # start bottom
-        (x0, y0_start),  # close
-    ]
-
-    codes = [
-        Path.MOVETO,
-        Path.CURVE4, Path.CURVE4, Path.CURVE4,
-        Path.LINETO,
-        Path.CURVE4, Path.CURVE4, Path.CURVE4,
-        Path.CLOSEPOLY,
-    ]
-
-    path = Path(verts, codes)
-    patch = mpatches.PathPatch(path, facecolor=color, edgecolor='none', alpha=alpha, zorder=zorder)
-    ax.add_patch(patch)
-
-
-def draw_bar(ax, x, y_bottom, y_top, width, color, alpha=1.0, zorder=1):
-    """Draw a vertical bar."""
-    rect = mpatches.Rectangle((x - width/2, y_bottom), width, y_top - y_bottom,
-                                facecolor=color, edgecolor='none', alpha=alpha, zorder=zorder)
-    ax.add_patch(rect)
-
-
-def make_sankey(age, data):
-    """Create overlaid Sankey for a given age."""
-    fig, ax = plt.subplots(figsize=(11, 11), dpi=100)
-    fig.patch.set_facecolor(BG)
+    # start top, control 1, control 2, end top, end bottom,
+    # control 3, control 4, start bottom, close
+    verts = np.empty((9, 2))
+    verts[:, 0] = (x0, cx, cx, x1, x1, cx, cx, x0, x0)
+    verts[:, 1] = (y0_start, y0_start, y1_start, y1_start, y1_end, y1_end, y0_end, y0_end, y0_start)
+
+    paths.append((verts, _FLOW_CODES))
+
+
+def draw_bar(paths, x, y_bottom, y_top, width):
+    """Append a vertical bar to `paths` (wound the same way as the flows)."""
+    x0, x1 = x - width/2, x + width/2
+    verts = np.empty((5, 2))
+    verts[:, 0] = (x0, x1, x1, x0, x0)
+    verts[:, 1] = (y_bottom, y_bottom, y_top, y_top, y_bottom)
+    paths.append((verts, _BAR_CODES))
+
+
+def add_layer(ax, paths, color, alpha, zorder):
+    """Add all of one generation's flows and bars as a single compound patch."""
+    verts = np.concatenate([v for v, _ in paths])
+    codes = np.concatenate([c for _, c in paths])
+    ax.add_patch(mpatches.PathPatch(Path(verts, codes, readonly=True), facecolor=color, edgecolor='none',
+                                    alpha=alpha, zorder=zorder))
+
+
+def make_sankey(age, data, ax):
+    """Draw the overlaid Sankey for a given age onto a cleared `ax`."""
+    ax.clear()
     ax.set_facecolor(BG)
 
     # Layout: x positions for each stage
@@ -123,6 +138,12 @@ def make_sankey(age, data):
 
     bar_width = 0.04
 
+    # Bar edges the flows and side labels attach to
+    x_birth_r = x_birth + bar_width/2
+    x_head_l, x_head_r = x_head - bar_width/2, x_head + bar_width/2
+    x_mar_l, x_mar_r = x_married - bar_width/2, x_married + bar_width/2
+    x_own_l, x_own_r = x_own - bar_width/2, x_own + bar_width/2
+
     # Y scale: 0-100, with some padding
     # We'll position flows from top to bottom
 
@@ -145,12 +166,6 @@ def make_sankey(age, data):
         married = d['married']
         single = d['single']
 
-        # Stage 3: Outcomes
-        m_own = d['married_owner']
-        m_rent = d['married_renter']
-        s_own = d['single_owner']
-        s_rent = d['single_renter']
-
         # Y positions (from top, y=100 is top, y=0 is bottom)
         pos = {}
 
@@ -171,17 +186,13 @@ def make_sankey(age, data):
         pos['married'] = (married_bottom, heads_top)
         pos['single'] = (heads_bottom, married_bottom)
 
-        # Outcomes for married
-        pos['m_own'] = (100 - m_own, 100)
-        pos['m_rent'] = (100 - m_own - m_rent, 100 - m_own)
-
-        # Outcomes for single
-        single_top = 100 - m_own - m_rent
-        pos['s_own'] = (single_top - s_own, single_top)
-        pos['s_rent'] = (single_top - s_own - s_rent, single_top - s_own)
-
-        # Not heads flow to renter
-        pos['nh_rent'] = (0, not_heads)
+        # Stage 3: outcome segments stacked down from the top in one cumsum
+        # (married own/rent, single own/rent, then not-heads renting at the bottom)
+        vals = np.array([d[k] for k in SEG_KEYS])
+        tops = 100 - np.concatenate([[0], np.cumsum(vals[:-1])])
+        bottoms = tops - vals
+        for key, bottom, top in zip(SEG_POS, bottoms, tops):
+            pos[key] = (bottom, top)
 
         return pos
 
@@ -189,231 +200,210 @@ def make_sankey(age, data):
     m_pos = calc_positions(m)
 
     # Draw Boomers first (behind, cream, semi-transparent)
-    boomer_alpha = 0.55
-    boomer_color = CREAM_DARK
+    b_paths = []
 
     # Birth bar
-    draw_bar(ax, x_birth, 0, 100, bar_width, boomer_color, boomer_alpha, zorder=1)
+    draw_bar(b_paths, x_birth, 0, 100, bar_width)
 
     # Birth -> Heads
-    draw_flow(ax, x_birth + bar_width/2, b_pos['heads'][0], b_pos['heads'][1],
-              x_head - bar_width/2, b_pos['heads'][0], b_pos['heads'][1],
-              boomer_color, boomer_alpha, zorder=1)
+    draw_flow(b_paths, x_birth_r, b_pos['heads'][0], b_pos['heads'][1],
+              x_head_l, b_pos['heads'][0], b_pos['heads'][1])
 
     # Birth -> Not Heads
-    draw_flow(ax, x_birth + bar_width/2, b_pos['not_heads'][0], b_pos['not_heads'][1],
-              x_head - bar_width/2, b_pos['not_heads'][0], b_pos['not_heads'][1],
-              boomer_color, boomer_alpha, zorder=1)
+    draw_flow(b_paths, x_birth_r, b_pos['not_heads'][0], b_pos['not_heads'][1],
+              x_head_l, b_pos['not_heads'][0], b_pos['not_heads'][1])
 
-    # Heads bar
-    draw_bar(ax, x_head, b_pos['heads'][0], b_pos['heads'][1], bar_width, boomer_color, boomer_alpha, zorder=1)
-    # Not heads bar
-    draw_bar(ax, x_head, b_pos['not_heads'][0], b_pos['not_heads'][1], bar_width, boomer_color, boomer_alpha, zorder=1)
+    # Heads and not-heads bars (stacked, so one full-height rectangle)
+    draw_bar(b_paths, x_head, b_pos['not_heads'][0], b_pos['heads'][1], bar_width)
 
     # Heads -> Married
-    draw_flow(ax, x_head + bar_width/2, b_pos['married'][0], b_pos['married'][1],
-              x_married - bar_width/2, b_pos['m_own'][0], b_pos['m_rent'][1],
-              boomer_color, boomer_alpha, zorder=1)
+    draw_flow(b_paths, x_head_r, b_pos['married'][0], b_pos['married'][1],
+              x_mar_l, b_pos['m_own'][0], b_pos['m_rent'][1])
 
     # Heads -> Single
-    draw_flow(ax, x_head + bar_width/2, b_pos['single'][0], b_pos['single'][1],
-              x_married - bar_width/2, b_pos['s_own'][0], b_pos['s_rent'][1],
-              boomer_color, boomer_alpha, zorder=1)
+    draw_flow(b_paths, x_head_r, b_pos['single'][0], b_pos['single'][1],
+              x_mar_l, b_pos['s_own'][0], b_pos['s_rent'][1])
 
     # Married bar
-    draw_bar(ax, x_married, b_pos['m_own'][0], b_pos['m_rent'][1], bar_width, boomer_color, boomer_alpha, zorder=1)
+    draw_bar(b_paths, x_married, b_pos['m_own'][0], b_pos['m_rent'][1], bar_width)
     # Single bar
-    draw_bar(ax, x_married, b_pos['s_own'][0], b_pos['s_rent'][1], bar_width, boomer_color, boomer_alpha, zorder=1)
+    draw_bar(b_paths, x_married, b_pos['s_own'][0], b_pos['s_rent'][1], bar_width)
 
     # Married -> Own
-    draw_flow(ax, x_married + bar_width/2, b_pos['m_own'][0], b_pos['m_own'][1],
-              x_own - bar_width/2, b_pos['m_own'][0], b_pos['m_own'][1],
-              boomer_color, boomer_alpha, zorder=1)
+    draw_flow(b_paths, x_mar_r, b_pos['m_own'][0], b_pos['m_own'][1],
+              x_own_l, b_pos['m_own'][0], b_pos['m_own'][1])
     # Married -> Rent
-    draw_flow(ax, x_married + bar_width/2, b_pos['m_rent'][0], b_pos['m_rent'][1],
-              x_own - bar_width/2, b_pos['m_rent'][0], b_pos['m_rent'][1],
-              boomer_color, boomer_alpha, zorder=1)
+    draw_flow(b_paths, x_mar_r, b_pos['m_rent'][0], b_pos['m_rent'][1],
+              x_own_l, b_pos['m_rent'][0], b_pos['m_rent'][1])
     # Single -> Own
-    draw_flow(ax, x_married + bar_width/2, b_pos['s_own'][0], b_pos['s_own'][1],
-              x_own - bar_width/2, b_pos['s_own'][0], b_pos['s_own'][1],
-              boomer_color, boomer_alpha, zorder=1)
+    draw_flow(b_paths, x_mar_r, b_pos['s_own'][0], b_pos['s_own'][1],
+              x_own_l, b_pos['s_own'][0], b_pos['s_own'][1])
     # Single -> Rent
-    draw_flow(ax, x_married + bar_width/2, b_pos['s_rent'][0], b_pos['s_rent'][1],
-              x_own - bar_width/2, b_pos['s_rent'][0], b_pos['s_rent'][1],
-              boomer_color, boomer_alpha, zorder=1)
+    draw_flow(b_paths, x_mar_r, b_pos['s_rent'][0], b_pos['s_rent'][1],
+              x_own_l, b_pos['s_rent'][0], b_pos['s_rent'][1])
 
     # Not Heads -> Rent (bottom)
-    draw_flow(ax, x_head + bar_width/2, b_pos['not_heads'][0], b_pos['not_heads'][1],
-              x_own - bar_width/2, b_pos['nh_rent'][0], b_pos['nh_rent'][1],
-              boomer_color, boomer_alpha, zorder=1)
+    draw_flow(b_paths, x_head_r, b_pos['not_heads'][0], b_pos['not_heads'][1],
+              x_own_l, b_pos['nh_rent'][0], b_pos['nh_rent'][1])
 
-    # Final bars for Boomers
-    draw_bar(ax, x_own, b_pos['m_own'][0], b_pos['m_own'][1], bar_width, boomer_color, boomer_alpha, zorder=1)
-    draw_bar(ax, x_own, b_pos['m_rent'][0], b_pos['m_rent'][1], bar_width, boomer_color, boomer_alpha, zorder=1)
-    draw_bar(ax, x_own, b_pos['s_own'][0], b_pos['s_own'][1], bar_width, boomer_color, boomer_alpha, zorder=1)
-    draw_bar(ax, x_own, b_pos['s_rent'][0], b_pos['s_rent'][1], bar_width, boomer_color, boomer_alpha, zorder=1)
-    draw_bar(ax, x_own, b_pos['nh_rent'][0], b_pos['nh_rent'][1], bar_width, boomer_color, boomer_alpha, zorder=1)
+    # Final bars for Boomers: the five outcome segments stack edge to edge,
+    # so they fill as one rectangle
+    draw_bar(b_paths, x_own, b_pos['nh_rent'][0], b_pos['m_own'][1], bar_width)
+
+    add_layer(ax, b_paths, CREAM_PREMUL, 1.0, zorder=1)
 
     # Now draw Millennials (front, blue)
     mill_alpha = 0.85
     mill_color = BLUE
+    m_paths = []
 
     # Birth bar
-    draw_bar(ax, x_birth, 0, 100, bar_width, mill_color, mill_alpha, zorder=2)
+    draw_bar(m_paths, x_birth, 0, 100, bar_width)
 
     # Birth -> Heads
-    draw_flow(ax, x_birth + bar_width/2, m_pos['heads'][0], m_pos['heads'][1],
-              x_head - bar_width/2, m_pos['heads'][0], m_pos['heads'][1],
-              mill_color, mill_alpha, zorder=2)
+    draw_flow(m_paths, x_birth_r, m_pos['heads'][0], m_pos['heads'][1],
+              x_head_l, m_pos['heads'][0], m_pos['heads'][1])
 
     # Birth -> Not Heads
-    draw_flow(ax, x_birth + bar_width/2, m_pos['not_heads'][0], m_pos['not_heads'][1],
-              x_head - bar_width/2, m_pos['not_heads'][0], m_pos['not_heads'][1],
-              mill_color, mill_alpha, zorder=2)
+    draw_flow(m_paths, x_birth_r, m_pos['not_heads'][0], m_pos['not_heads'][1],
+              x_head_l, m_pos['not_heads'][0], m_pos['not_heads'][1])
 
-    # Heads bar
-    draw_bar(ax, x_head, m_pos['heads'][0], m_pos['heads'][1], bar_width, mill_color, mill_alpha, zorder=2)
-    # Not heads bar
-    draw_bar(ax, x_head, m_pos['not_heads'][0], m_pos['not_heads'][1], bar_width, mill_color, mill_alpha, zorder=2)
+    # Heads and not-heads bars (stacked, so one full-height rectangle)
+    draw_bar(m_paths, x_head, m_pos['not_heads'][0], m_pos['heads'][1], bar_width)
 
     # Heads -> Married
-    draw_flow(ax, x_head + bar_width/2, m_pos['married'][0], m_pos['married'][1],
-              x_married - bar_width/2, m_pos['m_own'][0], m_pos['m_rent'][1],
-              mill_color, mill_alpha, zorder=2)
+    draw_flow(m_paths, x_head_r, m_pos['married'][0], m_pos['married'][1],
+              x_mar_l, m_pos['m_own'][0], m_pos['m_rent'][1])
 
     # Heads -> Single
-    draw_flow(ax, x_head + bar_width/2, m_pos['single'][0], m_pos['single'][1],
-              x_married - bar_width/2, m_pos['s_own'][0], m_pos['s_rent'][1],
-              mill_color, mill_alpha, zorder=2)
+    draw_flow(m_paths, x_head_r, m_pos['single'][0], m_pos['single'][1],
+              x_mar_l, m_pos['s_own'][0], m_pos['s_rent'][1])
 
     # Married bar
-    draw_bar(ax, x_married, m_pos['m_own'][0], m_pos['m_rent'][1], bar_width, mill_color, mill_alpha, zorder=2)
+    draw_bar(m_paths, x_married, m_pos['m_own'][0], m_pos['m_rent'][1], bar_width)
     # Single bar
-    draw_bar(ax, x_married, m_pos['s_own'][0], m_pos['s_rent'][1], bar_width, mill_color, mill_alpha, zorder=2)
+    draw_bar(m_paths, x_married, m_pos['s_own'][0], m_pos['s_rent'][1], bar_width)
 
     # Married -> Own
-    draw_flow(ax, x_married + bar_width/2, m_pos['m_own'][0], m_pos['m_own'][1],
-              x_own - bar_width/2, m_pos['m_own'][0], m_pos['m_own'][1],
-              mill_color, mill_alpha, zorder=2)
+    draw_flow(m_paths, x_mar_r, m_pos['m_own'][0], m_pos['m_own'][1],
+              x_own_l, m_pos['m_own'][0], m_pos['m_own'][1])
     # Married -> Rent
-    draw_flow(ax, x_married + bar_width/2, m_pos['m_rent'][0], m_pos['m_rent'][1],
-              x_own - bar_width/2, m_pos['m_rent'][0], m_pos['m_rent'][1],
-              mill_color, mill_alpha, zorder=2)
+    draw_flow(m_paths, x_mar_r, m_pos['m_rent'][0], m_pos['m_rent'][1],
+              x_own_l, m_pos['m_rent'][0], m_pos['m_rent'][1])
     # Single -> Own
-    draw_flow(ax, x_married + bar_width/2, m_pos['s_own'][0], m_pos['s_own'][1],
-              x_own - bar_width/2, m_pos['s_own'][0], m_pos['s_own'][1],
-              mill_color, mill_alpha, zorder=2)
+    draw_flow(m_paths, x_mar_r, m_pos['s_own'][0], m_pos['s_own'][1],
+              x_own_l, m_pos['s_own'][0], m_pos['s_own'][1])
     # Single -> Rent
-    draw_flow(ax, x_married + bar_width/2, m_pos['s_rent'][0], m_pos['s_rent'][1],
-              x_own - bar_width/2, m_pos['s_rent'][0], m_pos['s_rent'][1],
-              mill_color, mill_alpha, zorder=2)
+    draw_flow(m_paths, x_mar_r, m_pos['s_rent'][0], m_pos['s_rent'][1],
+              x_own_l, m_pos['s_rent'][0], m_pos['s_rent'][1])
 
     # Not Heads -> Rent (bottom)
-    draw_flow(ax, x_head + bar_width/2, m_pos['not_heads'][0], m_pos['not_heads'][1],
-              x_own - bar_width/2, m_pos['nh_rent'][0], m_pos['nh_rent'][1],
-              mill_color, mill_alpha, zorder=2)
+    draw_flow(m_paths, x_head_r, m_pos['not_heads'][0], m_pos['not_heads'][1],
+              x_own_l, m_pos['nh_rent'][0], m_pos['nh_rent'][1])
+
+    # Final bars for Millennials: the five outcome segments stack edge to edge,
+    # so they fill as one rectangle
+    draw_bar(m_paths, x_own, m_pos['nh_rent'][0], m_pos['m_own'][1], bar_width)
 
-    # Final bars for Millennials
-    draw_bar(ax, x_own, m_pos['m_own'][0], m_pos['m_own'][1], bar_width, mill_color, mill_alpha, zorder=2)
-    draw_bar(ax, x_own, m_pos['m_rent'][0], m_pos['m_rent'][1], bar_width, mill_color, mill_alpha, zorder=2)
-    draw_bar(ax, x_own, m_pos['s_own'][0], m_pos['s_own'][1], bar_width, mill_color, mill_alpha, zorder=2)
-    draw_bar(ax, x_own, m_pos['s_rent'][0], m_pos['s_rent'][1], bar_width, mill_color, mill_alpha, zorder=2)
-    draw_bar(ax, x_own, m_pos['nh_rent'][0], m_pos['nh_rent'][1], bar_width, mill_color, mill_alpha, zorder=2)
+    add_layer(ax, m_paths, mill_color, mill_alpha, zorder=2)
 
     # ── Labels ──
-    # Stage labels (centered in flows)
-    ax.text(x_birth, -5, 'BIRTH', ha='center', va='top', fontsize=10, fontweight='bold', color=BLACK)
+    for x, y, s, kw in STATIC_TEXTS:
+        ax.text(x, y, s, color=BLACK, **kw)
 
+    # Stage labels (centered in flows)
     ax.text((x_birth + x_head)/2, (m_pos['heads'][0] + m_pos['heads'][1])/2,
-            'BECOME\nHOUSEHOLD\nHEADS', ha='center', va='center', fontsize=9, fontweight='bold', color=BLACK)
+            'BECOME\nHOUSEHOLD\nHEADS', ha='center', va='center', fontproperties=STAGE_FP, color=BLACK)
 
     ax.text((x_birth + x_head)/2, m_pos['not_heads'][1]/2,
-            'LIVE WITH\nPARENTS / FRIENDS', ha='center', va='center', fontsize=9, fontweight='bold', color=BLACK)
+            'LIVE WITH\nPARENTS / FRIENDS', ha='center', va='center', fontproperties=STAGE_FP, color=BLACK)
 
     ax.text((x_head + x_married)/2, (m_pos['m_own'][0] + m_pos['m_rent'][1])/2,
-            'GET\nMARRIED', ha='center', va='center', fontsize=9, fontweight='bold', color=BLACK)
+            'GET\nMARRIED', ha='center', va='center', fontproperties=STAGE_FP, color=BLACK)
 
     ax.text((x_head + x_married)/2, (m_pos['s_own'][0] + m_pos['s_rent'][1])/2,
-            'REMAIN\nSINGLE', ha='center', va='center', fontsize=9, fontweight='bold', color=BLACK)
+            'REMAIN\nSINGLE', ha='center', va='center', fontproperties=STAGE_FP, color=BLACK)
 
     # Outcome labels (right side)
-    ax.text(x_own + bar_width/2 + 0.02, (m_pos['m_own'][0] + m_pos['m_own'][1])/2,
-            'BUY\nHOME', ha='left', va='center', fontsize=9, fontweight='bold', color=BLACK)
+    ax.text(x_own_r + 0.02, (m_pos['m_own'][0] + m_pos['m_own'][1])/2,
+            'BUY\nHOME', ha='left', va='center', fontproperties=STAGE_FP, color=BLACK)
 
-    ax.text(x_own + bar_width/2 + 0.02, (m_pos['m_rent'][0] + m_pos['m_rent'][1])/2,
-            'RENT', ha='left', va='center', fontsize=9, fontweight='bold', color=BLACK)
+    ax.text(x_own_r + 0.02, (m_pos['m_rent'][0] + m_pos['m_rent'][1])/2,
+            'RENT', ha='left', va='center', fontproperties=STAGE_FP, color=BLACK)
 
-    ax.text(x_own + bar_width/2 + 0.02, (m_pos['s_own'][0] + m_pos['s_own'][1])/2,
-            'BUY\nHOME', ha='left', va='center', fontsize=9, fontweight='bold', color=BLACK)
+    ax.text(x_own_r + 0.02, (m_pos['s_own'][0] + m_pos['s_own'][1])/2,
+            'BUY\nHOME', ha='left', va='center', fontproperties=STAGE_FP, color=BLACK)
 
-    ax.text(x_own + bar_width/2 + 0.02, (m_pos['s_rent'][0] + m_pos['nh_rent'][1])/2,
-            'RENT', ha='left', va='center', fontsize=9, fontweight='bold', color=BLACK)
+    ax.text(x_own_r + 0.02, (m_pos['s_rent'][0] + m_pos['nh_rent'][1])/2,
+            'RENT', ha='left', va='center', fontproperties=STAGE_FP, color=BLACK)
 
     # Percentage labels on right edge
     label_x = 0.98
 
     # Married owner
     ax.text(label_x, (b_pos['m_own'][0] + b_pos['m_own'][1])/2,
-            f"{b['married_owner']:.0f}%", ha='right', va='center', fontsize=10, color=CREAM_DARK, fontweight='bold')
+            f"{b['married_owner']:.0f}%", ha='right', va='center', fontproperties=LABEL_FP, color=CREAM_DARK)
     ax.text(label_x, (m_pos['m_own'][0] + m_pos['m_own'][1])/2 - 5,
-            f"{m['married_owner']:.0f}%", ha='right', va='center', fontsize=10, color=BLUE, fontweight='bold')
+            f"{m['married_owner']:.0f}%", ha='right', va='center', fontproperties=LABEL_FP, color=BLUE)
 
     # Married renter
     ax.text(label_x, (b_pos['m_rent'][0] + b_pos['m_rent'][1])/2,
-            f"{b['married_renter']:.0f}%", ha='right', va='center', fontsize=10, color=CREAM_DARK, fontweight='bold')
+            f"{b['married_renter']:.0f}%", ha='right', va='center', fontproperties=LABEL_FP, color=CREAM_DARK)
     ax.text(label_x, (m_pos['m_rent'][0] + m_pos['m_rent'][1])/2 - 3,
-            f"{m['married_renter']:.0f}%", ha='right', va='center', fontsize=10, color=BLUE, fontweight='bold')
+            f"{m['married_renter']:.0f}%", ha='right', va='center', fontproperties=LABEL_FP, color=BLUE)
 
     # Single owner
     ax.text(label_x, (b_pos['s_own'][0] + b_pos['s_own'][1])/2 + 2,
-            f"{b['single_owner']:.0f}%", ha='right', va='center', fontsize=10, color=CREAM_DARK, fontweight='bold')
+            f"{b['single_owner']:.0f}%", ha='right', va='center', fontproperties=LABEL_FP, color=CREAM_DARK)
     ax.text(label_x, (m_pos['s_own'][0] + m_pos['s_own'][1])/2 - 2,
-            f"{m['single_owner']:.0f}%", ha='right', va='center', fontsize=10, color=BLUE, fontweight='bold')
+            f"{m['single_owner']:.0f}%", ha='right', va='center', fontproperties=LABEL_FP, color=BLUE)
 
     # Bottom renter (single renter + not heads)
     b_bottom_rent = b['single_renter'] + b['not_heads']
     m_bottom_rent = m['single_renter'] + m['not_heads']
     ax.text(label_x, b['not_heads']/2 + 5,
-            f"{b_bottom_rent:.0f}%", ha='right', va='center', fontsize=10, color=CREAM_DARK, fontweight='bold')
+            f"{b_bottom_rent:.0f}%", ha='right', va='center', fontproperties=LABEL_FP, color=CREAM_DARK)
     ax.text(label_x, m['not_heads']/2 - 2,
-            f"{m_bottom_rent:.0f}%", ha='right', va='center', fontsize=10, color=BLUE, fontweight='bold')
+            f"{m_bottom_rent:.0f}%", ha='right', va='center', fontproperties=LABEL_FP, color=BLUE)
 
     # Not head percentages (left side, below the not-heads bar)
-    ax.text(x_head + bar_width/2 + 0.02, m['not_heads'] + 2,
-            f"{m['not_heads']:.0f}%", ha='left', va='bottom', fontsize=10, color=BLUE, fontweight='bold')
-    ax.text(x_head + bar_width/2 + 0.02, b['not_heads'] - 2,
-            f"{b['not_heads']:.0f}%", ha='left', va='top', fontsize=10, color=CREAM_DARK, fontweight='bold')
+    ax.text(x_head_r + 0.02, m['not_heads'] + 2,
+            f"{m['not_heads']:.0f}%", ha='left', va='bottom', fontproperties=LABEL_FP, color=BLUE)
+    ax.text(x_head_r + 0.02, b['not_heads'] - 2,
+            f"{b['not_heads']:.0f}%", ha='left', va='top', fontproperties=LABEL_FP, color=CREAM_DARK)
 
     # ── Legend ──
     ax.add_patch(mpatches.Rectangle((0.05, 108), 0.04, 3, facecolor=CREAM_DARK, alpha=0.6))
-    ax.text(0.10, 109.5, 'Boomers', va='center', fontsize=10, color=BLACK)
     ax.add_patch(mpatches.Rectangle((0.05, 103), 0.04, 3, facecolor=BLUE, alpha=0.85))
-    ax.text(0.10, 104.5, 'Millennials', va='center', fontsize=10, color=BLACK)
 
     # ── Title ──
     ax.text(0.02, 118, f'Lower rates of household formation and marriage explain a lot of\nthe Millennial-Boomer homeownership gap at age {age}',
             fontsize=14, fontweight='bold', color=BLACK, va='top')
 
-    # ── Source ──
-    ax.text(0.02, -10, 'Source: CPS ASEC via IPUMS', fontsize=9, color=BLACK, alpha=0.6, style='italic')
-
     # Axis setup
     ax.set_xlim(0, 1)
     ax.set_ylim(-15, 125)
     ax.axis('off')
 
-    return fig
+
+def render_age(age, data):
+    """Draw one age and write its PNG and SVG (runs in a worker process)."""
+    fig, ax = canvas(figsize=(11, 11))
+    make_sankey(age, data, ax)
+    save(fig, f'sankey_overlaid_age_{age}')
+    return age
 
 
-# Generate charts for all three ages
-for age in [30, 35, 40]:
-    data = get_data(age)
-    fig = make_sankey(age, data)
+if __name__ == '__main__':
+    # One query (or cache read) in the parent; the connection never reaches
+    # the workers
+    con = connect()
+    per_age = get_data(con, AGES)
+    con.close()
 
-    fig.savefig(f'{OUT}/sankey_overlaid_age_{age}.png', dpi=150, bbox_inches='tight', facecolor=BG)
-    plt.rcParams['svg.fonttype'] = 'none'
-    fig.savefig(f'{OUT}/sankey_overlaid_age_{age}.svg', bbox_inches='tight', facecolor=BG)
-    plt.close()
-    print(f"Saved sankey_overlaid_age_{age}")
+    # The figures are independent, so each age renders in its own process
+    with ProcessPoolExecutor(max_workers=len(AGES)) as ex:
+        for age in ex.map(render_age, AGES, [per_age[a] for a in AGES]):
+            print(f"Saved sankey_overlaid_age_{age}")
 
-print("Done!")
+    print("Done!")
@@ -0,0 +1,22 @@
+"""
+Driver: render Sankey v2 and v3 for all three ages in parallel.
+
+Both versions read the same cached flow query, so it is fetched once here and
+the six independent figures are spread over worker processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from sankey_common import AGES, get_data
+import sankey_overlaid_v2 as v2
+import sankey_overlaid_v3 as v3
+
+if __name__ == '__main__':
+    per_age = get_data(AGES)
+    jobs = [(version, age) for version in (v2, v3) for age in AGES]
+    with ProcessPoolExecutor(max_workers=len(jobs)) as ex:
+        futures = [(version, ex.submit(version.render_age, age, per_age[age])) for version, age in jobs]
+        for version, fut in futures:
+            print(f"Saved {version.__name__}_age_{fut.result()}")
+
+    print("Done!")
@@ -3,89 +3,65 @@ Overlaid Sankey v3: Draw Boomer "halo" (excess over Millennials) separately.
 This creates the visual effect where cream shows where Boomers exceed Millennials.
 """
 
-import duckdb
-import numpy as np
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import matplotlib.font_manager as fm
+from concurrent.futures import ProcessPoolExecutor
 
-FONT_DIR = "/Users/azizsunderji/Dropbox/Home Economics/Brand Assets/OracleFont/Oracle Aziz Sunderji/Desktop"
-for f in ['ABCOracle-Regular.otf', 'ABCOracle-Bold.otf', 'ABCOracle-Light.otf', 'ABCOracle-Medium.otf']:
-    fm.fontManager.addfont(f"{FONT_DIR}/{f}")
-plt.rcParams['font.family'] = 'ABC Oracle Edu'
+import matplotlib.patches as mpatches
+from matplotlib.collections import PolyCollection
+import numpy as np
+from sankey_common import (AGES, BG, BLACK, BLUE, CREAM, SEG_KEYS, bar, canvas, get_data, save,
+                           straight_flow as flow)
 
-BLUE = '#0BB4FF'
-CREAM = '#DADFCE'
+# ── Colors ──
 CREAM_DARK = '#C5C9B8'
-BG = '#F6F7F3'
-BLACK = '#3D3733'
-
-DATA = '/Users/azizsunderji/Dropbox/Home Economics/Data/CPS_ASEC/cps_asec.parquet'
-OUT = '/Users/azizsunderji/Dropbox/Home Economics/2025_12_29_OwnershipRates/2025_12_29_FirstApproach/outputs'
-
-con = duckdb.connect()
-
-
-def get_data(age):
-    q = f"""
-    WITH persons AS (
-        SELECT *,
-            CASE WHEN (YEAR-AGE) BETWEEN 1946 AND 1964 THEN 'Boomer'
-                 WHEN (YEAR-AGE) BETWEEN 1981 AND 1996 THEN 'Millennial' END AS generation,
-            CASE WHEN RELATE IN (101, 201, 202, 203) THEN 1 ELSE 0 END AS is_head,
-            CASE WHEN MARST IN (1, 2) OR RELATE IN (201, 202, 203) THEN 1 ELSE 0 END AS is_married,
-            CASE WHEN OWNERSHP = 10 THEN 1 ELSE 0 END AS is_owner
-        FROM '{DATA}'
-        WHERE AGE = {age} AND YEAR != 2014
-          AND ((YEAR-AGE) BETWEEN 1946 AND 1996)
-    )
-    SELECT
-        generation,
-        SUM(CASE WHEN is_head=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS heads,
-        SUM(CASE WHEN is_head=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS not_heads,
-        SUM(CASE WHEN is_head=1 AND is_married=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS married,
-        SUM(CASE WHEN is_head=1 AND is_married=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS single,
-        SUM(CASE WHEN is_head=1 AND is_married=1 AND is_owner=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS m_own,
-        SUM(CASE WHEN is_head=1 AND is_married=1 AND is_owner=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS m_rent,
-        SUM(CASE WHEN is_head=1 AND is_married=0 AND is_owner=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS s_own,
-        SUM(CASE WHEN is_head=1 AND is_married=0 AND is_owner=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS s_rent
-    FROM persons WHERE generation IS NOT NULL
-    GROUP BY generation ORDER BY generation
-    """
-    df = con.execute(q).df()
-    return {
-        'Boomer': df[df['generation'] == 'Boomer'].iloc[0].to_dict(),
-        'Millennial': df[df['generation'] == 'Millennial'].iloc[0].to_dict()
-    }
-
-
-def smooth_flow(ax, x0, x1, y0_top, y0_bot, y1_top, y1_bot, color, alpha, zorder):
-    """Draw smooth flow between two vertical segments."""
-    n = 60
-    t = np.linspace(0, 1, n)
-    ease = 3*t**2 - 2*t**3  # ease in-out
-
-    x = x0 + (x1 - x0) * ease
-    top = y0_top + (y1_top - y0_top) * ease
-    bot = y0_bot + (y1_bot - y0_bot) * ease
-
-    verts = list(zip(x, top)) + list(zip(x[::-1], bot[::-1]))
-    poly = mpatches.Polygon(verts, facecolor=color, edgecolor='none', alpha=alpha, zorder=zorder)
-    ax.add_patch(poly)
-
-
-def bar(ax, x, w, y_top, y_bot, color, alpha, zorder):
-    """Draw vertical bar."""
-    rect = mpatches.Rectangle((x - w/2, y_bot), w, y_top - y_bot,
-                               facecolor=color, edgecolor='none', alpha=alpha, zorder=zorder)
-    ax.add_patch(rect)
-
-
-def make_sankey(age, data):
-    fig, ax = plt.subplots(figsize=(11, 10), dpi=100)
-    fig.patch.set_facecolor(BG)
+
+# Rows and columns of the (top, bottom) layout arrays from get_ys
+HEADS, NH, MAR, SIN, MO, MR, SO, SR, NHR = range(9)
+TOP, BOT = 0, 1
+
+
+def get_ys(d):
+    """Cumulative y positions (from top=100 going down), (top, bottom) per row."""
+    y = np.empty((9, 2))
+    # Stage 1: heads top, not_heads bottom
+    y[HEADS] = 100, 100 - d['heads']
+    y[NH] = d['not_heads'], 0
+
+    # Stage 2: married top of heads area, single below
+    y[MAR] = 100, 100 - d['married']
+    y[SIN] = y[MAR, BOT], 100 - d['heads']
+
+    # Stage 3: cumulative from top, in one cumsum
+    vals = np.array([d[k] for k in SEG_KEYS])
+    tops = 100 - np.concatenate([[0], np.cumsum(vals)])
+    y[MO:NHR, TOP] = tops[:-1]
+    y[MO:NHR, BOT] = tops[:-1] - vals
+    y[NHR] = tops[-1], 0
+
+    return y
+
+
+def draw_static(ax):
+    """Draw the labels every age shares (BIRTH, legend, source) onto `ax`."""
+    ax.text(0.08, -5, 'BIRTH', ha='center', va='top', fontsize=11, fontweight='bold', color=BLACK)
+
+    # Legend
+    ly = 107
+    ax.add_patch(mpatches.Rectangle((0.08, ly), 0.04, 3, facecolor=CREAM, alpha=0.6))
+    ax.text(0.13, ly + 1.5, 'Boomers', va='center', fontsize=11, color=BLACK)
+    ax.add_patch(mpatches.Rectangle((0.08, ly - 5), 0.04, 3, facecolor=BLUE, alpha=0.85))
+    ax.text(0.13, ly - 3.5, 'Millennials', va='center', fontsize=11, color=BLACK)
+
+    # Source
+    ax.text(0.02, -8, 'Source: CPS ASEC via IPUMS', fontsize=9, color=BLACK, alpha=0.6, style='italic')
+
+    ax.set_xlim(0, 1.05)
+    ax.set_ylim(-12, 125)
+    ax.axis('off')
+
+
+def make_sankey(age, data, ax):
+    """Draw the overlaid Sankey for given age onto a cleared `ax`."""
+    ax.clear()
     ax.set_facecolor(BG)
 
     b = data['Boomer']
@@ -95,140 +71,110 @@ def make_sankey(age, data):
     x0, x1, x2, x3 = 0.08, 0.32, 0.62, 0.92
     w = 0.035
 
-    # Calculate cumulative y positions (from top=100 going down)
-    def get_ys(d):
-        y = {}
-        # Stage 1: heads top, not_heads bottom
-        y['heads_top'] = 100
-        y['heads_bot'] = 100 - d['heads']
-        y['nh_top'] = d['not_heads']
-        y['nh_bot'] = 0
-
-        # Stage 2: married top of heads area, single below
-        y['mar_top'] = 100
-        y['mar_bot'] = 100 - d['married']
-        y['sin_top'] = y['mar_bot']
-        y['sin_bot'] = 100 - d['heads']
-
-        # Stage 3: cumulative from top
-        c = 0
-        y['mo_top'] = 100 - c; c += d['m_own']; y['mo_bot'] = 100 - c
-        y['mr_top'] = 100 - c; c += d['m_rent']; y['mr_bot'] = 100 - c
-        y['so_top'] = 100 - c; c += d['s_own']; y['so_bot'] = 100 - c
-        y['sr_top'] = 100 - c; c += d['s_rent']; y['sr_bot'] = 100 - c
-        y['nhr_top'] = 100 - c; y['nhr_bot'] = 0
-
-        return y
-
     yb = get_ys(b)
     ym = get_ys(m)
+    # Segment midpoints for the labels, one vectorized pass per generation
+    yb_mid = (yb[:, TOP] + yb[:, BOT]) / 2
+    ym_mid = (ym[:, TOP] + ym[:, BOT]) / 2
 
     # === LAYER 1: Boomer background (full, semi-transparent) ===
     ba = 0.45  # Boomer alpha
     bz = 1     # Boomer z-order
+    b_polys = []
 
     # Birth
-    bar(ax, x0, w, 100, 0, CREAM, ba, bz)
+    bar(b_polys, x0, w, 100, 0)
 
     # Birth -> Heads
-    smooth_flow(ax, x0+w/2, x1-w/2, 100, yb['heads_bot'], 100, yb['heads_bot'], CREAM, ba, bz)
+    flow(b_polys, x0+w/2, x1-w/2, 100, yb[HEADS, BOT], 100, yb[HEADS, BOT])
     # Birth -> Not-heads
-    smooth_flow(ax, x0+w/2, x1-w/2, yb['nh_top'], 0, yb['nh_top'], 0, CREAM, ba, bz)
+    flow(b_polys, x0+w/2, x1-w/2, yb[NH, TOP], 0, yb[NH, TOP], 0)
 
-    # Stage 1 bars
-    bar(ax, x1, w, 100, yb['heads_bot'], CREAM, ba, bz)
-    bar(ax, x1, w, yb['nh_top'], 0, CREAM, ba, bz)
+    # Stage 1 bars (heads over not-heads, edge to edge, so one rectangle)
+    bar(b_polys, x1, w, 100, 0)
 
     # Heads -> Married/Single
-    smooth_flow(ax, x1+w/2, x2-w/2, 100, yb['mar_bot'], 100, yb['mar_bot'], CREAM, ba, bz)
-    smooth_flow(ax, x1+w/2, x2-w/2, yb['sin_top'], yb['sin_bot'], yb['sin_top'], yb['sin_bot'], CREAM, ba, bz)
+    flow(b_polys, x1+w/2, x2-w/2, 100, yb[MAR, BOT], 100, yb[MAR, BOT])
+    flow(b_polys, x1+w/2, x2-w/2, yb[SIN, TOP], yb[SIN, BOT], yb[SIN, TOP], yb[SIN, BOT])
 
-    # Stage 2 bars
-    bar(ax, x2, w, 100, yb['mar_bot'], CREAM, ba, bz)
-    bar(ax, x2, w, yb['sin_top'], yb['sin_bot'], CREAM, ba, bz)
+    # Stage 2 bars (married over single, one rectangle)
+    bar(b_polys, x2, w, 100, yb[SIN, BOT])
 
     # Married -> Own/Rent
-    smooth_flow(ax, x2+w/2, x3-w/2, 100, yb['mo_bot'], 100, yb['mo_bot'], CREAM, ba, bz)
-    smooth_flow(ax, x2+w/2, x3-w/2, yb['mr_top'], yb['mar_bot'], yb['mr_top'], yb['mr_bot'], CREAM, ba, bz)
+    flow(b_polys, x2+w/2, x3-w/2, 100, yb[MO, BOT], 100, yb[MO, BOT])
+    flow(b_polys, x2+w/2, x3-w/2, yb[MR, TOP], yb[MAR, BOT], yb[MR, TOP], yb[MR, BOT])
 
     # Single -> Own/Rent
-    smooth_flow(ax, x2+w/2, x3-w/2, yb['sin_top'], yb['so_bot'], yb['so_top'], yb['so_bot'], CREAM, ba, bz)
-    smooth_flow(ax, x2+w/2, x3-w/2, yb['so_bot'], yb['sin_bot'], yb['sr_top'], yb['sr_bot'], CREAM, ba, bz)
+    flow(b_polys, x2+w/2, x3-w/2, yb[SIN, TOP], yb[SO, BOT], yb[SO, TOP], yb[SO, BOT])
+    flow(b_polys, x2+w/2, x3-w/2, yb[SO, BOT], yb[SIN, BOT], yb[SR, TOP], yb[SR, BOT])
 
     # Not-heads -> Rent
-    smooth_flow(ax, x1+w/2, x3-w/2, yb['nh_top'], 0, yb['nhr_top'], 0, CREAM, ba, bz)
+    flow(b_polys, x1+w/2, x3-w/2, yb[NH, TOP], 0, yb[NHR, TOP], 0)
+
+    # Stage 3 bars: the five outcomes stack edge to edge, one rectangle
+    bar(b_polys, x3, w, 100, 0)
 
-    # Stage 3 bars
-    bar(ax, x3, w, yb['mo_top'], yb['mo_bot'], CREAM, ba, bz)
-    bar(ax, x3, w, yb['mr_top'], yb['mr_bot'], CREAM, ba, bz)
-    bar(ax, x3, w, yb['so_top'], yb['so_bot'], CREAM, ba, bz)
-    bar(ax, x3, w, yb['sr_top'], yb['sr_bot'], CREAM, ba, bz)
-    bar(ax, x3, w, yb['nhr_top'], yb['nhr_bot'], CREAM, ba, bz)
+    ax.add_collection(PolyCollection(b_polys, facecolors=CREAM, edgecolors='none', alpha=ba, zorder=bz))
 
     # === LAYER 2: Millennial foreground ===
     ma = 0.85
     mz = 2
+    m_polys = []
 
     # Birth
-    bar(ax, x0, w, 100, 0, BLUE, ma, mz)
+    bar(m_polys, x0, w, 100, 0)
 
     # Birth -> Heads
-    smooth_flow(ax, x0+w/2, x1-w/2, 100, ym['heads_bot'], 100, ym['heads_bot'], BLUE, ma, mz)
+    flow(m_polys, x0+w/2, x1-w/2, 100, ym[HEADS, BOT], 100, ym[HEADS, BOT])
     # Birth -> Not-heads
-    smooth_flow(ax, x0+w/2, x1-w/2, ym['nh_top'], 0, ym['nh_top'], 0, BLUE, ma, mz)
+    flow(m_polys, x0+w/2, x1-w/2, ym[NH, TOP], 0, ym[NH, TOP], 0)
 
-    # Stage 1 bars
-    bar(ax, x1, w, 100, ym['heads_bot'], BLUE, ma, mz)
-    bar(ax, x1, w, ym['nh_top'], 0, BLUE, ma, mz)
+    # Stage 1 bars (heads over not-heads, edge to edge, so one rectangle)
+    bar(m_polys, x1, w, 100, 0)
 
     # Heads -> Married/Single
-    smooth_flow(ax, x1+w/2, x2-w/2, 100, ym['mar_bot'], 100, ym['mar_bot'], BLUE, ma, mz)
-    smooth_flow(ax, x1+w/2, x2-w/2, ym['sin_top'], ym['sin_bot'], ym['sin_top'], ym['sin_bot'], BLUE, ma, mz)
+    flow(m_polys, x1+w/2, x2-w/2, 100, ym[MAR, BOT], 100, ym[MAR, BOT])
+    flow(m_polys, x1+w/2, x2-w/2, ym[SIN, TOP], ym[SIN, BOT], ym[SIN, TOP], ym[SIN, BOT])
 
-    # Stage 2 bars
-    bar(ax, x2, w, 100, ym['mar_bot'], BLUE, ma, mz)
-    bar(ax, x2, w, ym['sin_top'], ym['sin_bot'], BLUE, ma, mz)
+    # Stage 2 bars (married over single, one rectangle)
+    bar(m_polys, x2, w, 100, ym[SIN, BOT])
 
     # Married -> Own/Rent
-    smooth_flow(ax, x2+w/2, x3-w/2, 100, ym['mo_bot'], 100, ym['mo_bot'], BLUE, ma, mz)
-    smooth_flow(ax, x2+w/2, x3-w/2, ym['mr_top'], ym['mar_bot'], ym['mr_top'], ym['mr_bot'], BLUE, ma, mz)
+    flow(m_polys, x2+w/2, x3-w/2, 100, ym[MO, BOT], 100, ym[MO, BOT])
+    flow(m_polys, x2+w/2, x3-w/2, ym[MR, TOP], ym[MAR, BOT], ym[MR, TOP], ym[MR, BOT])
 
     # Single -> Own/Rent
-    smooth_flow(ax, x2+w/2, x3-w/2, ym['sin_top'], ym['so_bot'], ym['so_top'], ym['so_bot'], BLUE, ma, mz)
-    smooth_flow(ax, x2+w/2, x3-w/2, ym['so_bot'], ym['sin_bot'], ym['sr_top'], ym['sr_bot'], BLUE, ma, mz)
+    flow(m_polys, x2+w/2, x3-w/2, ym[SIN, TOP], ym[SO, BOT], ym[SO, TOP], ym[SO, BOT])
+    flow(m_polys, x2+w/2, x3-w/2, ym[SO, BOT], ym[SIN, BOT], ym[SR, TOP], ym[SR, BOT])
 
     # Not-heads -> Rent
-    smooth_flow(ax, x1+w/2, x3-w/2, ym['nh_top'], 0, ym['nhr_top'], 0, BLUE, ma, mz)
+    flow(m_polys, x1+w/2, x3-w/2, ym[NH, TOP], 0, ym[NHR, TOP], 0)
+
+    # Stage 3 bars: the five outcomes stack edge to edge, one rectangle
+    bar(m_polys, x3, w, 100, 0)
 
-    # Stage 3 bars
-    bar(ax, x3, w, ym['mo_top'], ym['mo_bot'], BLUE, ma, mz)
-    bar(ax, x3, w, ym['mr_top'], ym['mr_bot'], BLUE, ma, mz)
-    bar(ax, x3, w, ym['so_top'], ym['so_bot'], BLUE, ma, mz)
-    bar(ax, x3, w, ym['sr_top'], ym['sr_bot'], BLUE, ma, mz)
-    bar(ax, x3, w, ym['nhr_top'], ym['nhr_bot'], BLUE, ma, mz)
+    ax.add_collection(PolyCollection(m_polys, facecolors=BLUE, edgecolors='none', alpha=ma, zorder=mz))
 
     # === LABELS ===
     # Stage labels
-    ax.text(x0, -5, 'BIRTH', ha='center', va='top', fontsize=11, fontweight='bold', color=BLACK)
-
-    ax.text((x0+x1)/2, (100 + ym['heads_bot'])/2 + 3, 'BECOME\nHOUSEHOLD\nHEADS',
+    ax.text((x0+x1)/2, ym_mid[HEADS] + 3, 'BECOME\nHOUSEHOLD\nHEADS',
             ha='center', va='center', fontsize=10, fontweight='bold', color=BLACK, zorder=10)
 
-    ax.text((x0+x1)/2, ym['nh_top']/2, 'LIVE WITH\nPARENTS / FRIENDS',
+    ax.text((x0+x1)/2, ym[NH, TOP]/2, 'LIVE WITH\nPARENTS / FRIENDS',
             ha='center', va='center', fontsize=10, fontweight='bold', color=BLACK, zorder=10)
 
-    ax.text((x1+x2)/2, (100 + ym['mar_bot'])/2, 'GET\nMARRIED',
+    ax.text((x1+x2)/2, ym_mid[MAR], 'GET\nMARRIED',
             ha='center', va='center', fontsize=10, fontweight='bold', color=BLACK, zorder=10)
 
-    ax.text((x1+x2)/2, (ym['sin_top'] + ym['sin_bot'])/2, 'REMAIN\nSINGLE',
+    ax.text((x1+x2)/2, ym_mid[SIN], 'REMAIN\nSINGLE',
             ha='center', va='center', fontsize=10, fontweight='bold', color=BLACK, zorder=10)
 
     # Outcome labels
-    ax.text(x3 + w/2 + 0.015, (ym['mo_top'] + yb['mo_bot'])/2, 'BUY\nHOME',
+    ax.text(x3 + w/2 + 0.015, (ym[MO, TOP] + yb[MO, BOT])/2, 'BUY\nHOME',
             ha='left', va='center', fontsize=10, fontweight='bold', color=BLACK)
-    ax.text(x3 + w/2 + 0.015, (ym['mr_top'] + yb['mr_bot'])/2, 'RENT',
+    ax.text(x3 + w/2 + 0.015, (ym[MR, TOP] + yb[MR, BOT])/2, 'RENT',
             ha='left', va='center', fontsize=10, fontweight='bold', color=BLACK)
-    ax.text(x3 + w/2 + 0.015, (ym['so_top'] + yb['so_bot'])/2, 'BUY\nHOME',
+    ax.text(x3 + w/2 + 0.015, (ym[SO, TOP] + yb[SO, BOT])/2, 'BUY\nHOME',
             ha='left', va='center', fontsize=10, fontweight='bold', color=BLACK)
     ax.text(x3 + w/2 + 0.015, 12, 'RENT',
             ha='left', va='center', fontsize=10, fontweight='bold', color=BLACK)
@@ -237,65 +183,60 @@ def make_sankey(age, data):
     lx = 0.995
 
     # Married owners
-    ax.text(lx, (yb['mo_top'] + yb['mo_bot'])/2, f"{b['m_own']:.0f}%",
+    ax.text(lx, yb_mid[MO], f"{b['m_own']:.0f}%",
             ha='right', va='center', fontsize=11, fontweight='bold', color=CREAM_DARK)
-    ax.text(lx, (ym['mo_top'] + ym['mo_bot'])/2 - 5, f"{m['m_own']:.0f}%",
+    ax.text(lx, ym_mid[MO] - 5, f"{m['m_own']:.0f}%",
             ha='right', va='center', fontsize=11, fontweight='bold', color=BLUE)
 
     # Married renters
-    ax.text(lx, (yb['mr_top'] + yb['mr_bot'])/2, f"{b['m_rent']:.0f}%",
+    ax.text(lx, yb_mid[MR], f"{b['m_rent']:.0f}%",
             ha='right', va='center', fontsize=11, fontweight='bold', color=CREAM_DARK)
-    ax.text(lx, (ym['mr_top'] + ym['mr_bot'])/2 - 3, f"{m['m_rent']:.0f}%",
+    ax.text(lx, ym_mid[MR] - 3, f"{m['m_rent']:.0f}%",
             ha='right', va='center', fontsize=11, fontweight='bold', color=BLUE)
 
     # Single owners
-    ax.text(lx, (yb['so_top'] + yb['so_bot'])/2 + 2, f"{b['s_own']:.0f}%",
+    ax.text(lx, yb_mid[SO] + 2, f"{b['s_own']:.0f}%",
             ha='right', va='center', fontsize=11, fontweight='bold', color=CREAM_DARK)
-    ax.text(lx, (ym['so_top'] + ym['so_bot'])/2 - 2, f"{m['s_own']:.0f}%",
+    ax.text(lx, ym_mid[SO] - 2, f"{m['s_own']:.0f}%",
             ha='right', va='center', fontsize=11, fontweight='bold', color=BLUE)
 
     # Bottom rent
     b_bot = b['s_rent'] + b['not_heads']
     m_bot = m['s_rent'] + m['not_heads']
-    ax.text(lx, yb['nhr_top']/2 + 4, f"{b_bot:.0f}%",
+    ax.text(lx, yb[NHR, TOP]/2 + 4, f"{b_bot:.0f}%",
             ha='right', va='center', fontsize=11, fontweight='bold', color=CREAM_DARK)
-    ax.text(lx, ym['nhr_top']/2 - 2, f"{m_bot:.0f}%",
+    ax.text(lx, ym[NHR, TOP]/2 - 2, f"{m_bot:.0f}%",
             ha='right', va='center', fontsize=11, fontweight='bold', color=BLUE)
 
     # Not-head %s
-    ax.text(x1 + w/2 + 0.015, ym['nh_top'] + 2, f"{m['not_heads']:.0f}%",
+    ax.text(x1 + w/2 + 0.015, ym[NH, TOP] + 2, f"{m['not_heads']:.0f}%",
             ha='left', va='bottom', fontsize=11, fontweight='bold', color=BLUE)
-    ax.text(x1 + w/2 + 0.015, yb['nh_top'] - 2, f"{b['not_heads']:.0f}%",
+    ax.text(x1 + w/2 + 0.015, yb[NH, TOP] - 2, f"{b['not_heads']:.0f}%",
             ha='left', va='top', fontsize=11, fontweight='bold', color=CREAM_DARK)
 
-    # Legend
-    ly = 107
-    ax.add_patch(mpatches.Rectangle((0.08, ly), 0.04, 3, facecolor=CREAM, alpha=0.6))
-    ax.text(0.13, ly + 1.5, 'Boomers', va='center', fontsize=11, color=BLACK)
-    ax.add_patch(mpatches.Rectangle((0.08, ly - 5), 0.04, 3, facecolor=BLUE, alpha=0.85))
-    ax.text(0.13, ly - 3.5, 'Millennials', va='center', fontsize=11, color=BLACK)
-
     # Title
     ax.text(0.02, 120, f'Lower rates of household formation and marriage explain a lot of\nthe Millennial-Boomer homeownership gap at age {age}',
             fontsize=15, fontweight='bold', color=BLACK, va='top')
 
-    # Source
-    ax.text(0.02, -8, 'Source: CPS ASEC via IPUMS', fontsize=9, color=BLACK, alpha=0.6, style='italic')
-
     ax.set_xlim(0, 1.05)
     ax.set_ylim(-12, 125)
     ax.axis('off')
 
-    return fig
+
+def render_age(age, data):
+    """Draw one age and write its PNG and SVGZ (runs in a worker process)."""
+    fig, ax = canvas(draw_static)
+    make_sankey(age, data, ax)
+    save(fig, f'sankey_overlaid_v3_age_{age}', compress=True)
+    return age
 
 
-for age in [30, 35, 40]:
-    data = get_data(age)
-    fig = make_sankey(age, data)
-    fig.savefig(f'{OUT}/sankey_overlaid_v3_age_{age}.png', dpi=150, bbox_inches='tight', facecolor=BG)
-    plt.rcParams['svg.fonttype'] = 'none'
-    fig.savefig(f'{OUT}/sankey_overlaid_v3_age_{age}.svg', bbox_inches='tight', facecolor=BG)
-    plt.close()
-    print(f"Saved sankey_overlaid_v3_age_{age}")
+if __name__ == '__main__':
+    # One query in the parent; the figures are independent, so each age
+    # renders in its own process
+    per_age = get_data(AGES)
+    with ProcessPoolExecutor(max_workers=len(AGES)) as ex:
+        for age in ex.map(render_age, AGES, [per_age[a] for a in AGES]):
+            print(f"Saved sankey_overlaid_v3_age_{age}")
 
-print("Done!")
+    print("Done!")
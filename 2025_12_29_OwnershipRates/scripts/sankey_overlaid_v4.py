@@ -3,92 +3,29 @@ Overlaid Sankey v4: Draw Boomer "excess" areas explicitly (where B > M),
 then Millennial areas. This creates the halo effect properly.
 """
 
-import duckdb
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-import matplotlib.font_manager as fm
-
-FONT_DIR = "/Users/azizsunderji/Dropbox/Home Economics/Brand Assets/OracleFont/Oracle Aziz Sunderji/Desktop"
-for f in ['ABCOracle-Regular.otf', 'ABCOracle-Bold.otf', 'ABCOracle-Light.otf', 'ABCOracle-Medium.otf']:
-    fm.fontManager.addfont(f"{FONT_DIR}/{f}")
-plt.rcParams['font.family'] = 'ABC Oracle Edu'
-
-BLUE = '#0BB4FF'
-CREAM = '#DADFCE'
-BG = '#F6F7F3'
-BLACK = '#3D3733'
-
-DATA = '/Users/azizsunderji/Dropbox/Home Economics/Data/CPS_ASEC/cps_asec.parquet'
-OUT = '/Users/azizsunderji/Dropbox/Home Economics/2025_12_29_OwnershipRates/2025_12_29_FirstApproach/outputs'
-
-con = duckdb.connect()
-
-
-def get_data(age):
-    q = f"""
-    WITH persons AS (
-        SELECT *,
-            CASE WHEN (YEAR-AGE) BETWEEN 1946 AND 1964 THEN 'Boomer'
-                 WHEN (YEAR-AGE) BETWEEN 1981 AND 1996 THEN 'Millennial' END AS generation,
-            CASE WHEN RELATE IN (101, 201, 202, 203) THEN 1 ELSE 0 END AS is_head,
-            CASE WHEN MARST IN (1, 2) OR RELATE IN (201, 202, 203) THEN 1 ELSE 0 END AS is_married,
-            CASE WHEN OWNERSHP = 10 THEN 1 ELSE 0 END AS is_owner
-        FROM '{DATA}'
-        WHERE AGE = {age} AND YEAR != 2014
-          AND ((YEAR-AGE) BETWEEN 1946 AND 1996)
-    )
-    SELECT
-        generation,
-        SUM(CASE WHEN is_head=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS heads,
-        SUM(CASE WHEN is_head=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS not_heads,
-        SUM(CASE WHEN is_head=1 AND is_married=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS married,
-        SUM(CASE WHEN is_head=1 AND is_married=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS single,
-        SUM(CASE WHEN is_head=1 AND is_married=1 AND is_owner=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS m_own,
-        SUM(CASE WHEN is_head=1 AND is_married=1 AND is_owner=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS m_rent,
-        SUM(CASE WHEN is_head=1 AND is_married=0 AND is_owner=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS s_own,
-        SUM(CASE WHEN is_head=1 AND is_married=0 AND is_owner=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS s_rent
-    FROM persons WHERE generation IS NOT NULL
-    GROUP BY generation ORDER BY generation
-    """
-    df = con.execute(q).df()
-    return {
-        'Boomer': df[df['generation'] == 'Boomer'].iloc[0].to_dict(),
-        'Millennial': df[df['generation'] == 'Millennial'].iloc[0].to_dict()
-    }
-
-
-def flow(ax, x0, x1, y0_top, y0_bot, y1_top, y1_bot, color, alpha, zorder):
-    """Draw smooth S-curve flow."""
-    if y0_top <= y0_bot or y1_top <= y1_bot:
-        return  # Skip invalid flows
-
-    n = 50
-    t = np.linspace(0, 1, n)
-    ease = 3*t**2 - 2*t**3
+from matplotlib.collections import PolyCollection
+from sankey_common import (AGES, BG, BLACK, BLUE, CREAM, SEG_KEYS, bar, canvas, get_data, save,
+                           straight_flow)
 
-    x = x0 + (x1 - x0) * ease
-    top = y0_top + (y1_top - y0_top) * ease
-    bot = y0_bot + (y1_bot - y0_bot) * ease
 
-    verts = list(zip(x, top)) + list(zip(x[::-1], bot[::-1]))
-    poly = mpatches.Polygon(verts, facecolor=color, edgecolor='none', alpha=alpha, zorder=zorder)
-    ax.add_patch(poly)
+def outcome_spans(d):
+    """(top, bottom) of each stage-3 outcome, stacked down from 100 in one cumsum.
 
-
-def bar(ax, x, w, y_top, y_bot, color, alpha, zorder):
-    if y_top <= y_bot:
-        return
-    rect = mpatches.Rectangle((x - w/2, y_bot), w, y_top - y_bot,
-                               facecolor=color, edgecolor='none', alpha=alpha, zorder=zorder)
-    ax.add_patch(rect)
+    Married own/rent and single own/rent in SEG_KEYS order, then the
+    not-heads renting down to 0.
+    """
+    vals = np.array([d[k] for k in SEG_KEYS])
+    tops = 100 - np.concatenate([[0], np.cumsum(vals)])
+    return [*zip(tops[:-1], tops[:-1] - vals), (tops[-1], 0)]
 
 
-def make_sankey(age, data):
-    fig, ax = plt.subplots(figsize=(11, 10), dpi=100)
-    fig.patch.set_facecolor(BG)
+def make_sankey(age, data, ax):
+    """Draw the overlaid Sankey for given age onto a cleared `ax`."""
+    ax.clear()
     ax.set_facecolor(BG)
 
     b = data['Boomer']
@@ -106,12 +43,7 @@ def make_sankey(age, data):
     b_married = (100, 100 - b['married'])
     b_single = (100 - b['married'], 100 - b['married'] - b['single'])
 
-    bc = 0  # cumulative
-    b_mo = (100 - bc, 100 - bc - b['m_own']); bc += b['m_own']
-    b_mr = (100 - bc, 100 - bc - b['m_rent']); bc += b['m_rent']
-    b_so = (100 - bc, 100 - bc - b['s_own']); bc += b['s_own']
-    b_sr = (100 - bc, 100 - bc - b['s_rent']); bc += b['s_rent']
-    b_nhr = (100 - bc, 0)
+    b_mo, b_mr, b_so, b_sr, b_nhr = outcome_spans(b)
 
     # Millennial positions
     m_heads = (100, 100 - m['heads'])
@@ -119,110 +51,110 @@ def make_sankey(age, data):
     m_married = (100, 100 - m['married'])
     m_single = (100 - m['married'], 100 - m['married'] - m['single'])
 
-    mc = 0
-    m_mo = (100 - mc, 100 - mc - m['m_own']); mc += m['m_own']
-    m_mr = (100 - mc, 100 - mc - m['m_rent']); mc += m['m_rent']
-    m_so = (100 - mc, 100 - mc - m['s_own']); mc += m['s_own']
-    m_sr = (100 - mc, 100 - mc - m['s_rent']); mc += m['s_rent']
-    m_nhr = (100 - mc, 0)
+    m_mo, m_mr, m_so, m_sr, m_nhr = outcome_spans(m)
 
     cream_a = 0.55
     blue_a = 0.9
+    # Vertices per layer; each becomes one PolyCollection
+    cream, blue = [], []
 
     # === STAGE 0: BIRTH BAR ===
     # Draw both generations (cream behind, blue in front)
-    bar(ax, x0, w, 100, 0, CREAM, cream_a, 1)
-    bar(ax, x0, w, 100, 0, BLUE, blue_a, 2)
+    bar(cream, x0, w, 100, 0)
+    bar(blue, x0, w, 100, 0)
 
     # === STAGE 0->1: BIRTH TO HEADS/NOT-HEADS ===
 
     # HEADS flow: Both start at top (100), Boomers go lower (to b_heads[1]), Millennials higher (to m_heads[1])
     # Boomer excess (cream halo): from Millennial bottom to Boomer bottom
     if b_heads[1] < m_heads[1]:  # Boomers have more heads
-        flow(ax, x0+w/2, x1-w/2, m_heads[1], b_heads[1], m_heads[1], b_heads[1], CREAM, cream_a, 1)
+        straight_flow(cream, x0+w/2, x1-w/2, m_heads[1], b_heads[1], m_heads[1], b_heads[1])
     # Millennial heads
-    flow(ax, x0+w/2, x1-w/2, m_heads[0], m_heads[1], m_heads[0], m_heads[1], BLUE, blue_a, 2)
+    straight_flow(blue, x0+w/2, x1-w/2, m_heads[0], m_heads[1], m_heads[0], m_heads[1])
 
     # NOT-HEADS flow: Both start at bottom (0), Millennials go higher (to m_nh[0]), Boomers lower (to b_nh[0])
     # Millennial excess (blue larger): from Boomer top to Millennial top
     if m_nh[0] > b_nh[0]:  # Millennials have more not-heads
-        flow(ax, x0+w/2, x1-w/2, m_nh[0], b_nh[0], m_nh[0], b_nh[0], BLUE, blue_a, 2)
+        straight_flow(blue, x0+w/2, x1-w/2, m_nh[0], b_nh[0], m_nh[0], b_nh[0])
     # Boomer not-heads (cream)
-    flow(ax, x0+w/2, x1-w/2, b_nh[0], 0, b_nh[0], 0, CREAM, cream_a, 1)
+    straight_flow(cream, x0+w/2, x1-w/2, b_nh[0], 0, b_nh[0], 0)
 
     # Stage 1 bars
     # Heads bars
-    bar(ax, x1, w, m_heads[0], b_heads[1], CREAM, cream_a, 1)  # Full boomer extent
-    bar(ax, x1, w, m_heads[0], m_heads[1], BLUE, blue_a, 2)    # Millennial
+    bar(cream, x1, w, m_heads[0], b_heads[1])  # Full boomer extent
+    bar(blue, x1, w, m_heads[0], m_heads[1])    # Millennial
 
     # Not-heads bars
-    bar(ax, x1, w, m_nh[0], 0, BLUE, blue_a, 2)  # Millennial (larger)
-    bar(ax, x1, w, b_nh[0], 0, CREAM, cream_a, 1)  # Boomer (smaller, behind)
+    bar(blue, x1, w, m_nh[0], 0)  # Millennial (larger)
+    bar(cream, x1, w, b_nh[0], 0)  # Boomer (smaller, behind)
 
     # === STAGE 1->2: HEADS TO MARRIED/SINGLE ===
 
     # MARRIED: Boomers have more married
     if b_married[1] < m_married[1]:
-        flow(ax, x1+w/2, x2-w/2, m_married[1], b_married[1], m_married[1], b_married[1], CREAM, cream_a, 1)
-    flow(ax, x1+w/2, x2-w/2, m_married[0], m_married[1], m_married[0], m_married[1], BLUE, blue_a, 2)
+        straight_flow(cream, x1+w/2, x2-w/2, m_married[1], b_married[1], m_married[1], b_married[1])
+    straight_flow(blue, x1+w/2, x2-w/2, m_married[0], m_married[1], m_married[0], m_married[1])
 
     # SINGLE: flows from bottom of married to bottom of heads
     # This is trickier - need to show both generations
     # Draw Boomer single flow
-    flow(ax, x1+w/2, x2-w/2, b_single[0], b_single[1], b_single[0], b_single[1], CREAM, cream_a, 1)
+    straight_flow(cream, x1+w/2, x2-w/2, b_single[0], b_single[1], b_single[0], b_single[1])
     # Draw Millennial single flow
-    flow(ax, x1+w/2, x2-w/2, m_single[0], m_single[1], m_single[0], m_single[1], BLUE, blue_a, 2)
+    straight_flow(blue, x1+w/2, x2-w/2, m_single[0], m_single[1], m_single[0], m_single[1])
 
     # Stage 2 bars
-    bar(ax, x2, w, 100, b_married[1], CREAM, cream_a, 1)
-    bar(ax, x2, w, 100, m_married[1], BLUE, blue_a, 2)
+    bar(cream, x2, w, 100, b_married[1])
+    bar(blue, x2, w, 100, m_married[1])
 
-    bar(ax, x2, w, b_single[0], b_single[1], CREAM, cream_a, 1)
-    bar(ax, x2, w, m_single[0], m_single[1], BLUE, blue_a, 2)
+    bar(cream, x2, w, b_single[0], b_single[1])
+    bar(blue, x2, w, m_single[0], m_single[1])
 
     # === STAGE 2->3: TO OWNERSHIP OUTCOMES ===
 
     # Married -> Own
     if b_mo[1] < m_mo[1]:  # Boomers own more
-        flow(ax, x2+w/2, x3-w/2, m_mo[1], b_mo[1], m_mo[1], b_mo[1], CREAM, cream_a, 1)
-    flow(ax, x2+w/2, x3-w/2, m_mo[0], m_mo[1], m_mo[0], m_mo[1], BLUE, blue_a, 2)
+        straight_flow(cream, x2+w/2, x3-w/2, m_mo[1], b_mo[1], m_mo[1], b_mo[1])
+    straight_flow(blue, x2+w/2, x3-w/2, m_mo[0], m_mo[1], m_mo[0], m_mo[1])
 
     # Married -> Rent
-    flow(ax, x2+w/2, x3-w/2, b_mr[0], b_mr[1], b_mr[0], b_mr[1], CREAM, cream_a, 1)
-    flow(ax, x2+w/2, x3-w/2, m_mr[0], m_mr[1], m_mr[0], m_mr[1], BLUE, blue_a, 2)
+    straight_flow(cream, x2+w/2, x3-w/2, b_mr[0], b_mr[1], b_mr[0], b_mr[1])
+    straight_flow(blue, x2+w/2, x3-w/2, m_mr[0], m_mr[1], m_mr[0], m_mr[1])
 
     # Single -> Own
-    flow(ax, x2+w/2, x3-w/2, b_so[0], b_so[1], b_so[0], b_so[1], CREAM, cream_a, 1)
-    flow(ax, x2+w/2, x3-w/2, m_so[0], m_so[1], m_so[0], m_so[1], BLUE, blue_a, 2)
+    straight_flow(cream, x2+w/2, x3-w/2, b_so[0], b_so[1], b_so[0], b_so[1])
+    straight_flow(blue, x2+w/2, x3-w/2, m_so[0], m_so[1], m_so[0], m_so[1])
 
     # Single -> Rent
-    flow(ax, x2+w/2, x3-w/2, b_sr[0], b_sr[1], b_sr[0], b_sr[1], CREAM, cream_a, 1)
-    flow(ax, x2+w/2, x3-w/2, m_sr[0], m_sr[1], m_sr[0], m_sr[1], BLUE, blue_a, 2)
+    straight_flow(cream, x2+w/2, x3-w/2, b_sr[0], b_sr[1], b_sr[0], b_sr[1])
+    straight_flow(blue, x2+w/2, x3-w/2, m_sr[0], m_sr[1], m_sr[0], m_sr[1])
 
     # Not-heads -> Rent (bottom)
-    flow(ax, x1+w/2, x3-w/2, m_nh[0], 0, m_nhr[0], 0, BLUE, blue_a, 2)
-    flow(ax, x1+w/2, x3-w/2, b_nh[0], 0, b_nhr[0], 0, CREAM, cream_a, 1)
+    straight_flow(blue, x1+w/2, x3-w/2, m_nh[0], 0, m_nhr[0], 0)
+    straight_flow(cream, x1+w/2, x3-w/2, b_nh[0], 0, b_nhr[0], 0)
 
     # Stage 3 bars - draw both with proper layering
     # Married owners
-    bar(ax, x3, w, b_mo[0], b_mo[1], CREAM, cream_a, 1)
-    bar(ax, x3, w, m_mo[0], m_mo[1], BLUE, blue_a, 2)
+    bar(cream, x3, w, b_mo[0], b_mo[1])
+    bar(blue, x3, w, m_mo[0], m_mo[1])
 
     # Married renters
-    bar(ax, x3, w, b_mr[0], b_mr[1], CREAM, cream_a, 1)
-    bar(ax, x3, w, m_mr[0], m_mr[1], BLUE, blue_a, 2)
+    bar(cream, x3, w, b_mr[0], b_mr[1])
+    bar(blue, x3, w, m_mr[0], m_mr[1])
 
     # Single owners
-    bar(ax, x3, w, b_so[0], b_so[1], CREAM, cream_a, 1)
-    bar(ax, x3, w, m_so[0], m_so[1], BLUE, blue_a, 2)
+    bar(cream, x3, w, b_so[0], b_so[1])
+    bar(blue, x3, w, m_so[0], m_so[1])
 
     # Single renters
-    bar(ax, x3, w, b_sr[0], b_sr[1], CREAM, cream_a, 1)
-    bar(ax, x3, w, m_sr[0], m_sr[1], BLUE, blue_a, 2)
+    bar(cream, x3, w, b_sr[0], b_sr[1])
+    bar(blue, x3, w, m_sr[0], m_sr[1])
 
     # Bottom renters (not-heads)
-    bar(ax, x3, w, m_nhr[0], 0, BLUE, blue_a, 2)
-    bar(ax, x3, w, b_nhr[0], 0, CREAM, cream_a, 1)
+    bar(blue, x3, w, m_nhr[0], 0)
+    bar(cream, x3, w, b_nhr[0], 0)
+
+    ax.add_collection(PolyCollection(cream, facecolors=CREAM, edgecolors='none', alpha=cream_a, zorder=1))
+    ax.add_collection(PolyCollection(blue, facecolors=BLUE, edgecolors='none', alpha=blue_a, zorder=2))
 
     # === LABELS ===
     ax.text(x0, -5, 'BIRTH', ha='center', va='top', fontsize=11, fontweight='bold', color=BLACK)
@@ -295,16 +227,21 @@ def make_sankey(age, data):
     ax.set_ylim(-12, 125)
     ax.axis('off')
 
-    return fig
+
+def render_age(age, data):
+    """Draw one age and write its PNG and SVG (runs in a worker process)."""
+    fig, ax = canvas()
+    make_sankey(age, data, ax)
+    save(fig, f'sankey_overlaid_v4_age_{age}')
+    return age
 
 
-for age in [30, 35, 40]:
-    data = get_data(age)
-    fig = make_sankey(age, data)
-    fig.savefig(f'{OUT}/sankey_overlaid_v4_age_{age}.png', dpi=150, bbox_inches='tight', facecolor=BG)
-    plt.rcParams['svg.fonttype'] = 'none'
-    fig.savefig(f'{OUT}/sankey_overlaid_v4_age_{age}.svg', bbox_inches='tight', facecolor=BG)
-    plt.close()
-    print(f"Saved sankey_overlaid_v4_age_{age}")
+if __name__ == '__main__':
+    # One query in the parent; the figures are independent, so each age
+    # renders in its own process
+    per_age = get_data(AGES)
+    with ProcessPoolExecutor(max_workers=len(AGES)) as ex:
+        for age in ex.map(render_age, AGES, [per_age[a] for a in AGES]):
+            print(f"Saved sankey_overlaid_v4_age_{age}")
 
-print("Done!")
+    print("Done!")
@@ -7,93 +7,38 @@ Overlaid Sankey v5: BOTTOM-ALIGNED, matching the user's Illustrator technique.
 - Excess shows at TOP where one generation exceeds the other
 """
 
-import duckdb
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-import matplotlib.font_manager as fm
-
-FONT_DIR = "/Users/azizsunderji/Dropbox/Home Economics/Brand Assets/OracleFont/Oracle Aziz Sunderji/Desktop"
-for f in ['ABCOracle-Regular.otf', 'ABCOracle-Bold.otf', 'ABCOracle-Light.otf', 'ABCOracle-Medium.otf']:
-    fm.fontManager.addfont(f"{FONT_DIR}/{f}")
-plt.rcParams['font.family'] = 'ABC Oracle Edu'
-
-BLUE = '#0BB4FF'
-CREAM = '#DADFCE'
-BG = '#F6F7F3'
-BLACK = '#3D3733'
-
-DATA = '/Users/azizsunderji/Dropbox/Home Economics/Data/CPS_ASEC/cps_asec.parquet'
-OUT = '/Users/azizsunderji/Dropbox/Home Economics/2025_12_29_OwnershipRates/2025_12_29_FirstApproach/outputs'
-
-con = duckdb.connect()
-
-
-def get_data(age):
-    q = f"""
-    WITH persons AS (
-        SELECT *,
-            CASE WHEN (YEAR-AGE) BETWEEN 1946 AND 1964 THEN 'Boomer'
-                 WHEN (YEAR-AGE) BETWEEN 1981 AND 1996 THEN 'Millennial' END AS generation,
-            CASE WHEN RELATE IN (101, 201, 202, 203) THEN 1 ELSE 0 END AS is_head,
-            CASE WHEN MARST IN (1, 2) OR RELATE IN (201, 202, 203) THEN 1 ELSE 0 END AS is_married,
-            CASE WHEN OWNERSHP = 10 THEN 1 ELSE 0 END AS is_owner
-        FROM '{DATA}'
-        WHERE AGE = {age} AND YEAR != 2014
-          AND ((YEAR-AGE) BETWEEN 1946 AND 1996)
-    )
-    SELECT
-        generation,
-        SUM(CASE WHEN is_head=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS heads,
-        SUM(CASE WHEN is_head=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS not_heads,
-        SUM(CASE WHEN is_head=1 AND is_married=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS married,
-        SUM(CASE WHEN is_head=1 AND is_married=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS single,
-        SUM(CASE WHEN is_head=1 AND is_married=1 AND is_owner=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS m_own,
-        SUM(CASE WHEN is_head=1 AND is_married=1 AND is_owner=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS m_rent,
-        SUM(CASE WHEN is_head=1 AND is_married=0 AND is_owner=1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS s_own,
-        SUM(CASE WHEN is_head=1 AND is_married=0 AND is_owner=0 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS s_rent
-    FROM persons WHERE generation IS NOT NULL
-    GROUP BY generation ORDER BY generation
-    """
-    df = con.execute(q).df()
-    return {
-        'Boomer': df[df['generation'] == 'Boomer'].iloc[0].to_dict(),
-        'Millennial': df[df['generation'] == 'Millennial'].iloc[0].to_dict()
-    }
-
-
-def flow(ax, x0, x1, y0_bot, y0_top, y1_bot, y1_top, color, alpha, zorder):
-    """Draw smooth S-curve flow. Coordinates are (bottom, top) for each end."""
-    if y0_top <= y0_bot or y1_top <= y1_bot:
-        return
-
-    n = 50
-    t = np.linspace(0, 1, n)
-    ease = 3*t**2 - 2*t**3
-
-    x = x0 + (x1 - x0) * ease
-    top = y0_top + (y1_top - y0_top) * ease
-    bot = y0_bot + (y1_bot - y0_bot) * ease
-
-    verts = list(zip(x, top)) + list(zip(x[::-1], bot[::-1]))
-    poly = mpatches.Polygon(verts, facecolor=color, edgecolor='none', alpha=alpha, zorder=zorder)
-    ax.add_patch(poly)
-
-
-def bar(ax, x, w, y_bot, y_top, color, alpha, zorder):
-    """Draw vertical bar from y_bot to y_top."""
-    if y_top <= y_bot:
-        return
-    rect = mpatches.Rectangle((x - w/2, y_bot), w, y_top - y_bot,
-                               facecolor=color, edgecolor='none', alpha=alpha, zorder=zorder)
-    ax.add_patch(rect)
-
-
-def make_sankey(age, data):
-    fig, ax = plt.subplots(figsize=(11, 10), dpi=100)
-    fig.patch.set_facecolor(BG)
+from matplotlib.collections import PolyCollection
+import sankey_common
+from sankey_common import AGES, BG, BLACK, BLUE, CREAM, canvas, get_data, save
+
+# Stage-3 outcomes, stacked from the bottom up
+STACK_KEYS = ('not_heads', 's_rent', 's_own', 'm_rent', 'm_own')
+
+
+def flow(polys, x0, x1, y0_bot, y0_top, y1_bot, y1_top):
+    """Append flow to `polys`. Coordinates are (bottom, top) for each end."""
+    sankey_common.straight_flow(polys, x0, x1, y0_top, y0_bot, y1_top, y1_bot)
+
+
+def bar(polys, x, w, y_bot, y_top):
+    """Append vertical bar from y_bot to y_top to `polys`."""
+    sankey_common.bar(polys, x, w, y_top, y_bot)
+
+
+def outcome_spans(d):
+    """(bottom, top) of each stage-3 outcome in STACK_KEYS order, in one cumsum."""
+    vals = np.array([d[k] for k in STACK_KEYS])
+    bots = np.concatenate([[0], np.cumsum(vals)[:-1]])
+    return list(zip(bots, bots + vals))
+
+
+def make_sankey(age, data, ax):
+    """Draw the overlaid Sankey for given age onto a cleared `ax`."""
+    ax.clear()
     ax.set_facecolor(BG)
 
     b = data['Boomer']
@@ -158,21 +103,8 @@ def make_sankey(age, data):
 
     # Stage 3: Final outcomes, stacked from bottom
     # Order: not_heads_rent, single_rent, single_own, married_rent, married_own
-    # Boomer:
-    bc = 0
-    b_nhr = (bc, bc + b['not_heads']); bc += b['not_heads']
-    b_sr = (bc, bc + b['s_rent']); bc += b['s_rent']
-    b_so = (bc, bc + b['s_own']); bc += b['s_own']
-    b_mr = (bc, bc + b['m_rent']); bc += b['m_rent']
-    b_mo = (bc, bc + b['m_own'])
-
-    # Millennial:
-    mc = 0
-    m_nhr = (mc, mc + m['not_heads']); mc += m['not_heads']
-    m_sr = (mc, mc + m['s_rent']); mc += m['s_rent']
-    m_so = (mc, mc + m['s_own']); mc += m['s_own']
-    m_mr = (mc, mc + m['m_rent']); mc += m['m_rent']
-    m_mo = (mc, mc + m['m_own'])
+    b_nhr, b_sr, b_so, b_mr, b_mo = outcome_spans(b)
+    m_nhr, m_sr, m_so, m_mr, m_mo = outcome_spans(m)
 
     # Drawing: Bars opaque, flows semi-transparent
     bar_alpha = 1.0
@@ -180,87 +112,96 @@ def make_sankey(age, data):
 
     # === DRAW BOOMERS FIRST (cream, behind) ===
     bz = 1  # z-order
+    b_flows, b_bars = [], []
 
     # Birth bar
-    bar(ax, x0, w, 0, 100, CREAM, bar_alpha, bz)
+    bar(b_bars, x0, w, 0, 100)
 
     # Birth -> Heads flow
-    flow(ax, x0+w/2, x1-w/2, b_heads[0], b_heads[1], b_heads[0], b_heads[1], CREAM, flow_alpha, bz)
+    flow(b_flows, x0+w/2, x1-w/2, b_heads[0], b_heads[1], b_heads[0], b_heads[1])
     # Birth -> Not-heads flow
-    flow(ax, x0+w/2, x1-w/2, b_nh[0], b_nh[1], b_nh[0], b_nh[1], CREAM, flow_alpha, bz)
+    flow(b_flows, x0+w/2, x1-w/2, b_nh[0], b_nh[1], b_nh[0], b_nh[1])
 
     # Stage 1 bars
-    bar(ax, x1, w, b_heads[0], b_heads[1], CREAM, bar_alpha, bz)
-    bar(ax, x1, w, b_nh[0], b_nh[1], CREAM, bar_alpha, bz)
+    bar(b_bars, x1, w, b_heads[0], b_heads[1])
+    bar(b_bars, x1, w, b_nh[0], b_nh[1])
 
     # Heads -> Married flow
-    flow(ax, x1+w/2, x2-w/2, b_married[0], b_married[1], b_married[0], b_married[1], CREAM, flow_alpha, bz)
+    flow(b_flows, x1+w/2, x2-w/2, b_married[0], b_married[1], b_married[0], b_married[1])
     # Heads -> Single flow
-    flow(ax, x1+w/2, x2-w/2, b_single[0], b_single[1], b_single[0], b_single[1], CREAM, flow_alpha, bz)
+    flow(b_flows, x1+w/2, x2-w/2, b_single[0], b_single[1], b_single[0], b_single[1])
 
     # Stage 2 bars
-    bar(ax, x2, w, b_married[0], b_married[1], CREAM, bar_alpha, bz)
-    bar(ax, x2, w, b_single[0], b_single[1], CREAM, bar_alpha, bz)
+    bar(b_bars, x2, w, b_married[0], b_married[1])
+    bar(b_bars, x2, w, b_single[0], b_single[1])
 
     # Married -> Own/Rent flows
-    flow(ax, x2+w/2, x3-w/2, b_mo[0], b_mo[1], b_mo[0], b_mo[1], CREAM, flow_alpha, bz)
-    flow(ax, x2+w/2, x3-w/2, b_mr[0], b_mr[1], b_mr[0], b_mr[1], CREAM, flow_alpha, bz)
+    flow(b_flows, x2+w/2, x3-w/2, b_mo[0], b_mo[1], b_mo[0], b_mo[1])
+    flow(b_flows, x2+w/2, x3-w/2, b_mr[0], b_mr[1], b_mr[0], b_mr[1])
 
     # Single -> Own/Rent flows
-    flow(ax, x2+w/2, x3-w/2, b_so[0], b_so[1], b_so[0], b_so[1], CREAM, flow_alpha, bz)
-    flow(ax, x2+w/2, x3-w/2, b_sr[0], b_sr[1], b_sr[0], b_sr[1], CREAM, flow_alpha, bz)
+    flow(b_flows, x2+w/2, x3-w/2, b_so[0], b_so[1], b_so[0], b_so[1])
+    flow(b_flows, x2+w/2, x3-w/2, b_sr[0], b_sr[1], b_sr[0], b_sr[1])
 
     # Not-heads -> Rent flow
-    flow(ax, x1+w/2, x3-w/2, b_nhr[0], b_nhr[1], b_nhr[0], b_nhr[1], CREAM, flow_alpha, bz)
+    flow(b_flows, x1+w/2, x3-w/2, b_nhr[0], b_nhr[1], b_nhr[0], b_nhr[1])
 
     # Stage 3 bars
-    bar(ax, x3, w, b_mo[0], b_mo[1], CREAM, bar_alpha, bz)
-    bar(ax, x3, w, b_mr[0], b_mr[1], CREAM, bar_alpha, bz)
-    bar(ax, x3, w, b_so[0], b_so[1], CREAM, bar_alpha, bz)
-    bar(ax, x3, w, b_sr[0], b_sr[1], CREAM, bar_alpha, bz)
-    bar(ax, x3, w, b_nhr[0], b_nhr[1], CREAM, bar_alpha, bz)
+    bar(b_bars, x3, w, b_mo[0], b_mo[1])
+    bar(b_bars, x3, w, b_mr[0], b_mr[1])
+    bar(b_bars, x3, w, b_so[0], b_so[1])
+    bar(b_bars, x3, w, b_sr[0], b_sr[1])
+    bar(b_bars, x3, w, b_nhr[0], b_nhr[1])
+
+    # One collection per alpha: semi-transparent flows, then the opaque bars
+    ax.add_collection(PolyCollection(b_flows, facecolors=CREAM, edgecolors='none', alpha=flow_alpha, zorder=bz))
+    ax.add_collection(PolyCollection(b_bars, facecolors=CREAM, edgecolors='none', alpha=bar_alpha, zorder=bz))
 
     # === DRAW MILLENNIALS (blue, in front) ===
     mz = 2
+    m_flows, m_bars = [], []
 
     # Birth bar
-    bar(ax, x0, w, 0, 100, BLUE, bar_alpha, mz)
+    bar(m_bars, x0, w, 0, 100)
 
     # Birth -> Heads flow
-    flow(ax, x0+w/2, x1-w/2, m_heads[0], m_heads[1], m_heads[0], m_heads[1], BLUE, flow_alpha, mz)
+    flow(m_flows, x0+w/2, x1-w/2, m_heads[0], m_heads[1], m_heads[0], m_heads[1])
     # Birth -> Not-heads flow
-    flow(ax, x0+w/2, x1-w/2, m_nh[0], m_nh[1], m_nh[0], m_nh[1], BLUE, flow_alpha, mz)
+    flow(m_flows, x0+w/2, x1-w/2, m_nh[0], m_nh[1], m_nh[0], m_nh[1])
 
     # Stage 1 bars
-    bar(ax, x1, w, m_heads[0], m_heads[1], BLUE, bar_alpha, mz)
-    bar(ax, x1, w, m_nh[0], m_nh[1], BLUE, bar_alpha, mz)
+    bar(m_bars, x1, w, m_heads[0], m_heads[1])
+    bar(m_bars, x1, w, m_nh[0], m_nh[1])
 
     # Heads -> Married flow
-    flow(ax, x1+w/2, x2-w/2, m_married[0], m_married[1], m_married[0], m_married[1], BLUE, flow_alpha, mz)
+    flow(m_flows, x1+w/2, x2-w/2, m_married[0], m_married[1], m_married[0], m_married[1])
     # Heads -> Single flow
-    flow(ax, x1+w/2, x2-w/2, m_single[0], m_single[1], m_single[0], m_single[1], BLUE, flow_alpha, mz)
+    flow(m_flows, x1+w/2, x2-w/2, m_single[0], m_single[1], m_single[0], m_single[1])
 
     # Stage 2 bars
-    bar(ax, x2, w, m_married[0], m_married[1], BLUE, bar_alpha, mz)
-    bar(ax, x2, w, m_single[0], m_single[1], BLUE, bar_alpha, mz)
+    bar(m_bars, x2, w, m_married[0], m_married[1])
+    bar(m_bars, x2, w, m_single[0], m_single[1])
 
     # Married -> Own/Rent flows
-    flow(ax, x2+w/2, x3-w/2, m_mo[0], m_mo[1], m_mo[0], m_mo[1], BLUE, flow_alpha, mz)
-    flow(ax, x2+w/2, x3-w/2, m_mr[0], m_mr[1], m_mr[0], m_mr[1], BLUE, flow_alpha, mz)
+    flow(m_flows, x2+w/2, x3-w/2, m_mo[0], m_mo[1], m_mo[0], m_mo[1])
+    flow(m_flows, x2+w/2, x3-w/2, m_mr[0], m_mr[1], m_mr[0], m_mr[1])
 
     # Single -> Own/Rent flows
-    flow(ax, x2+w/2, x3-w/2, m_so[0], m_so[1], m_so[0], m_so[1], BLUE, flow_alpha, mz)
-    flow(ax, x2+w/2, x3-w/2, m_sr[0], m_sr[1], m_sr[0], m_sr[1], BLUE, flow_alpha, mz)
+    flow(m_flows, x2+w/2, x3-w/2, m_so[0], m_so[1], m_so[0], m_so[1])
+    flow(m_flows, x2+w/2, x3-w/2, m_sr[0], m_sr[1], m_sr[0], m_sr[1])
 
     # Not-heads -> Rent flow
-    flow(ax, x1+w/2, x3-w/2, m_nhr[0], m_nhr[1], m_nhr[0], m_nhr[1], BLUE, flow_alpha, mz)
+    flow(m_flows, x1+w/2, x3-w/2, m_nhr[0], m_nhr[1], m_nhr[0], m_nhr[1])
 
     # Stage 3 bars
-    bar(ax, x3, w, m_mo[0], m_mo[1], BLUE, bar_alpha, mz)
-    bar(ax, x3, w, m_mr[0], m_mr[1], BLUE, bar_alpha, mz)
-    bar(ax, x3, w, m_so[0], m_so[1], BLUE, bar_alpha, mz)
-    bar(ax, x3, w, m_sr[0], m_sr[1], BLUE, bar_alpha, mz)
-    bar(ax, x3, w, m_nhr[0], m_nhr[1], BLUE, bar_alpha, mz)
+    bar(m_bars, x3, w, m_mo[0], m_mo[1])
+    bar(m_bars, x3, w, m_mr[0], m_mr[1])
+    bar(m_bars, x3, w, m_so[0], m_so[1])
+    bar(m_bars, x3, w, m_sr[0], m_sr[1])
+    bar(m_bars, x3, w, m_nhr[0], m_nhr[1])
+
+    ax.add_collection(PolyCollection(m_flows, facecolors=BLUE, edgecolors='none', alpha=flow_alpha, zorder=mz))
+    ax.add_collection(PolyCollection(m_bars, facecolors=BLUE, edgecolors='none', alpha=bar_alpha, zorder=mz))
 
     # === LABELS ===
     ax.text(x0, -5, 'BIRTH', ha='center', va='top', fontsize=11, fontweight='bold', color=BLACK)
@@ -341,16 +282,21 @@ def make_sankey(age, data):
     ax.set_ylim(-12, 125)
     ax.axis('off')
 
-    return fig
+
+def render_age(age, data):
+    """Draw one age and write its PNG and SVG (runs in a worker process)."""
+    fig, ax = canvas()
+    make_sankey(age, data, ax)
+    save(fig, f'sankey_overlaid_v5_age_{age}')
+    return age
 
 
-for age in [30, 35, 40]:
-    data = get_data(age)
-    fig = make_sankey(age, data)
-    fig.savefig(f'{OUT}/sankey_overlaid_v5_age_{age}.png', dpi=150, bbox_inches='tight', facecolor=BG)
-    plt.rcParams['svg.fonttype'] = 'none'
-    fig.savefig(f'{OUT}/sankey_overlaid_v5_age_{age}.svg', bbox_inches='tight', facecolor=BG)
-    plt.close()
-    print(f"Saved sankey_overlaid_v5_age_{age}")
+if __name__ == '__main__':
+    # One query in the parent; the figures are independent, so each age
+    # renders in its own process
+    per_age = get_data(AGES)
+    with ProcessPoolExecutor(max_workers=len(AGES)) as ex:
+        for age in ex.map(render_age, AGES, [per_age[a] for a in AGES]):
+            print(f"Saved sankey_overlaid_v5_age_{age}")
 
-print("Done!")
+    print("Done!")
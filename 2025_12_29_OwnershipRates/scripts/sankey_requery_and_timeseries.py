@@ -6,19 +6,15 @@ Married = MARST in (1, 2) OR RELATE in (201, 202, 203)
 Owner = OWNERSHP = 10
 """
 
-import duckdb
-import pandas as pd
 import numpy as np
 import matplotlib
 matplotlib.use('agg')
 import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+from queries import connect, flag_cells
+import fonts
 
 # ── Fonts ──
-FONT_DIR = "/Users/azizsunderji/Dropbox/Home Economics/Brand Assets/OracleFont/Oracle Aziz Sunderji/Desktop"
-for f in ['ABCOracle-Regular.otf', 'ABCOracle-Bold.otf', 'ABCOracle-Light.otf', 'ABCOracle-Medium.otf']:
-    fm.fontManager.addfont(f"{FONT_DIR}/{f}")
-plt.rcParams['font.family'] = 'ABC Oracle Edu'
+fonts.setup()
 
 # ── Colors ──
 BLUE = '#0BB4FF'
@@ -28,10 +24,9 @@ BG = '#F6F7F3'
 CREAM = '#BBBFAE'  # darkened for visibility on light background
 LIGHT_CREAM = '#A5A999'
 
-DATA = '/Users/azizsunderji/Dropbox/Home Economics/Data/CPS_ASEC/cps_asec.parquet'
 OUT = '/Users/azizsunderji/Dropbox/Home Economics/2025_12_29_OwnershipRates/2025_12_29_FirstApproach/outputs'
 
-con = duckdb.connect()
+con = connect()
 
 # ══════════════════════════════════════════════════════════════
 # Time series by age: headship, marriage (of heads), ownership (of married heads)
@@ -39,58 +34,61 @@ con = duckdb.connect()
 # Married = MARST in (1,2) OR RELATE in (201, 202, 203)
 # ══════════════════════════════════════════════════════════════
 
-ts_query = """
-WITH persons AS (
-    SELECT *,
-        YEAR - AGE AS birth_year,
-        CASE
-            WHEN (YEAR - AGE) BETWEEN 1946 AND 1964 THEN 'Boomer'
-            WHEN (YEAR - AGE) BETWEEN 1981 AND 1996 THEN 'Millennial'
-        END AS generation,
-        CASE WHEN RELATE IN (101, 201, 202, 203) THEN 1 ELSE 0 END AS is_head,
-        CASE WHEN MARST IN (1, 2) OR RELATE IN (201, 202, 203) THEN 1 ELSE 0 END AS is_married,
-        CASE WHEN OWNERSHP = 10 THEN 1 ELSE 0 END AS is_owner
-    FROM '{data}'
-    WHERE AGE BETWEEN 20 AND 45
-      AND YEAR != 2014
-      AND ((YEAR - AGE) BETWEEN 1946 AND 1996)
-)
-SELECT
-    generation,
-    AGE,
-    -- Headship rate (of all people)
-    SUM(CASE WHEN is_head = 1 THEN ASECWT ELSE 0 END) / SUM(ASECWT) * 100 AS headship_rate,
-    -- Marriage rate (of heads only)
-    SUM(CASE WHEN is_head = 1 AND is_married = 1 THEN ASECWT ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN is_head = 1 THEN ASECWT ELSE 0 END), 0) * 100 AS marriage_rate_of_heads,
-    -- Ownership rate (of married heads only)
-    SUM(CASE WHEN is_head = 1 AND is_married = 1 AND is_owner = 1 THEN ASECWT ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN is_head = 1 AND is_married = 1 THEN ASECWT ELSE 0 END), 0) * 100 AS ownership_rate_married_heads,
-    SUM(ASECWT) AS total_pop
-FROM persons
-WHERE generation IS NOT NULL
-GROUP BY generation, AGE
-ORDER BY generation, AGE
-""".format(data=DATA)
-
-df_ts = con.execute(ts_query).df()
+# Rates are ratios of sums over the shared (head, married, owner) cells per
+# generation and age (queries.CELLS), cached on disk. Kept as
+# {generation: {column: array over the ages with data}}, no pandas frame.
+cells = flag_cells(con)
+ts_ages = np.arange(20, 46)
+ts = {}
+for gen in ['Boomer', 'Millennial']:
+    sel = cells['generation'] == gen
+    idx = cells['AGE'][sel] - ts_ages[0]
+    h, m, o, w = (cells[k][sel] for k in ('is_head', 'is_married', 'is_owner', 'w'))
+    # One weighted bincount per total, indexed by age
+    pop, heads, married_heads, married_owners = (
+        np.bincount(idx, weights=w * mask, minlength=len(ts_ages))
+        for mask in (1, h, h & m, h & m & o))
+    has = pop > 0
+    # A numerator never exceeds its denominator, so a zero denominator gives
+    # 0/0 = NaN, as NULLIF did
+    with np.errstate(invalid='ignore'):
+        ts[gen] = {
+            'AGE': ts_ages[has],
+            # Headship rate (of all people)
+            'headship_rate': (heads / pop * 100)[has],
+            # Marriage rate (of heads only)
+            'marriage_rate_of_heads': (married_heads / heads * 100)[has],
+            # Ownership rate (of married heads only)
+            'ownership_rate_married_heads': (married_owners / married_heads * 100)[has],
+            'total_pop': pop[has],
+        }
 
 # Print key ages for reference
 print("Key values at milestone ages:")
 for age in [30, 35, 40]:
     print(f"\n  Age {age}:")
     for gen in ['Boomer', 'Millennial']:
-        row = df_ts[(df_ts['generation'] == gen) & (df_ts['AGE'] == age)]
-        if not row.empty:
-            r = row.iloc[0]
-            print(f"    {gen}: headship={r['headship_rate']:.1f}%, marriage(heads)={r['marriage_rate_of_heads']:.1f}%, ownership(married heads)={r['ownership_rate_married_heads']:.1f}%")
+        t = ts[gen]
+        i = np.searchsorted(t['AGE'], age)
+        if i < len(t['AGE']) and t['AGE'][i] == age:
+            print(f"    {gen}: headship={t['headship_rate'][i]:.1f}%, marriage(heads)={t['marriage_rate_of_heads'][i]:.1f}%, ownership(married heads)={t['ownership_rate_married_heads'][i]:.1f}%")
         else:
             print(f"    {gen}: no data at this age")
 
 # ── Chart function ──
-def make_chart(df, col, title, subtitle, filename):
-    fig, ax = plt.subplots(figsize=(9, 7.5), dpi=100)
-    fig.patch.set_facecolor(BG)
+# One figure for all three charts; make_chart clears the axes and redraws.
+# The source line is the same on every chart, so it is drawn once here.
+fig, ax = plt.subplots(figsize=(9, 7.5), dpi=100)
+fig.patch.set_facecolor(BG)
+# Fixed margins (tuned once, from tight_layout(rect=[0, 0.03, 1, 0.95]))
+# instead of a layout pass per chart; the axes geometry is the same for all three
+fig.subplots_adjust(left=0.056512, right=0.983333, top=0.824, bottom=0.110185)
+fig.text(0.1, 0.01, 'Source: CPS ASEC via IPUMS (1976\u20132025, excluding 2014)',
+         fontsize=8, color=BLACK, alpha=0.5, style='italic')
+
+
+def make_chart(ts, col, title, subtitle, filename):
+    ax.clear()
     ax.set_facecolor(BG)
 
     # Plot lines
@@ -98,28 +96,31 @@ def make_chart(df, col, title, subtitle, filename):
         ('Boomer', CREAM, 3.0, 'Boomers'),
         ('Millennial', BLUE, 3.0, 'Millennials')
     ]:
-        g = df[df['generation'] == gen].sort_values('AGE')
+        g = ts[gen]
         ax.plot(g['AGE'], g[col], color=color, linewidth=lw, label=label, zorder=3)
 
-    # Vertical dotted lines and annotations at 30, 35, 40
+    # Vertical dotted lines at 30, 35, 40
     for age in [30, 35, 40]:
         ax.axvline(x=age, color=BLACK, linestyle=':', linewidth=0.8, alpha=0.3, zorder=1)
 
-        for gen, color, offset_y in [('Boomer', CREAM, 10), ('Millennial', BLUE, -16)]:
-            g = df[df['generation'] == gen]
-            row = g[g['AGE'] == age]
-            if not row.empty:
-                val = row[col].values[0]
-                # Dot on line
-                ax.plot(age, val, 'o', color=color, markersize=6, zorder=4,
-                        markeredgecolor='white', markeredgewidth=1.5)
-                # Annotation - color matches the line
-                ax.annotate(f'{val:.0f}%',
-                            xy=(age, val),
-                            xytext=(4, offset_y),
-                            textcoords='offset points',
-                            fontsize=10, fontweight='bold', color=color,
-                            zorder=5)
+    # Markers and labels at those ages, pulled out once per generation
+    xs, ys, cs, offsets = [], [], [], []
+    for gen, color, offset_y in [('Boomer', CREAM, 10), ('Millennial', BLUE, -16)]:
+        key = np.isin(ts[gen]['AGE'], [30, 35, 40])
+        xs += ts[gen]['AGE'][key].tolist()
+        ys += ts[gen][col][key].tolist()
+        cs += [color] * key.sum()
+        offsets += [offset_y] * key.sum()
+
+    ax.scatter(xs, ys, c=cs, s=36, edgecolors='white', linewidths=1.5, zorder=4)
+    # Label color matches the line
+    for x, val, color, offset_y in zip(xs, ys, cs, offsets):
+        ax.annotate(f'{val:.0f}%',
+                    xy=(x, val),
+                    xytext=(4, offset_y),
+                    textcoords='offset points',
+                    fontsize=10, fontweight='bold', color=color,
+                    zorder=5)
 
     # Y-axis formatting
     ymin, ymax = ax.get_ylim()
@@ -162,33 +163,28 @@ def make_chart(df, col, title, subtitle, filename):
     ax.legend(fontsize=11, loc='lower right', frameon=False,
               labelcolor=[CREAM, BLUE])
 
-    # Source
-    fig.text(0.1, 0.01, 'Source: CPS ASEC via IPUMS (1976\u20132025, excluding 2014)',
-             fontsize=8, color=BLACK, alpha=0.5, style='italic')
-
-    plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-
-    fig.savefig(f'{OUT}/{filename}.png', dpi=150, bbox_inches='tight', facecolor=BG)
-    plt.rcParams['svg.fonttype'] = 'none'
-    fig.savefig(f'{OUT}/{filename}.svg', bbox_inches='tight', facecolor=BG)
-    plt.close()
+    # Measure the tight bbox once and reuse it for both saves, instead of
+    # letting each savefig run its own measuring draw
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.1)
+    fig.savefig(f'{OUT}/{filename}.png', dpi=150, bbox_inches=bbox, facecolor=BG)
+    fig.savefig(f'{OUT}/{filename}.svg', bbox_inches=bbox, facecolor=BG)
     print(f"Saved {filename}")
 
 
 # ── Chart 1: Headship Rate ──
-make_chart(df_ts, 'headship_rate',
+make_chart(ts, 'headship_rate',
            'Headship rate by age',
            'Share of all people who head or co-head a household',
            'headship_rate_by_age')
 
 # ── Chart 2: Marriage Rate (of heads) ──
-make_chart(df_ts, 'marriage_rate_of_heads',
+make_chart(ts, 'marriage_rate_of_heads',
            'Marriage rate among household heads',
            'Share of household heads/co-heads who are married or partnered',
            'marriage_rate_heads_by_age')
 
 # ── Chart 3: Ownership Rate (of married heads) ──
-make_chart(df_ts, 'ownership_rate_married_heads',
+make_chart(ts, 'ownership_rate_married_heads',
            'Homeownership among married household heads',
            'Share of married/partnered heads who own their home',
            'ownership_rate_married_heads_by_age')
@@ -3,9 +3,12 @@ Three Sankey charts stacked vertically: Age 30, Age 35, Age 40.
 Each shows Boomers (left) and Millennials (right) side by side.
 """
 
-import duckdb
+from importlib.metadata import PackageNotFoundError, version
+
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
+from queries import connect, sankey_flows
 
 BLUE = '#0BB4FF'
 BLUE_LIGHT = 'rgba(11, 180, 255, 0.5)'
@@ -17,40 +20,17 @@ GREEN = '#67A275'
 YELLOW = '#FEC439'
 RED = '#F4743B'
 
-DATA = '/Users/azizsunderji/Dropbox/Home Economics/Data/CPS_ASEC/cps_asec.parquet'
 OUT = '/Users/azizsunderji/Dropbox/Home Economics/2025_12_29_OwnershipRates/2025_12_29_FirstApproach/outputs'
 
-con = duckdb.connect()
-
-def get_sankey_data(age):
-    """Get flow data for a given age."""
-    q = f"""
-    WITH persons AS (
-        SELECT *,
-            CASE WHEN (YEAR-AGE) BETWEEN 1946 AND 1964 THEN 'Boomer'
-                 WHEN (YEAR-AGE) BETWEEN 1981 AND 1996 THEN 'Millennial' END AS generation,
-            CASE WHEN RELATE IN (101, 201, 202, 203) THEN 1 ELSE 0 END AS is_head,
-            CASE WHEN MARST IN (1, 2) OR RELATE IN (201, 202, 203) THEN 1 ELSE 0 END AS is_married,
-            CASE WHEN OWNERSHP = 10 THEN 1 ELSE 0 END AS is_owner
-        FROM '{DATA}'
-        WHERE AGE = {age} AND YEAR != 2014
-          AND ((YEAR-AGE) BETWEEN 1946 AND 1996)
-    )
-    SELECT
-        generation,
-        SUM(ASECWT) AS total_pop,
-        SUM(CASE WHEN is_head=1 THEN ASECWT ELSE 0 END) AS heads,
-        SUM(CASE WHEN is_head=0 THEN ASECWT ELSE 0 END) AS not_heads,
-        SUM(CASE WHEN is_head=1 AND is_married=1 THEN ASECWT ELSE 0 END) AS married_heads,
-        SUM(CASE WHEN is_head=1 AND is_married=0 THEN ASECWT ELSE 0 END) AS single_heads,
-        SUM(CASE WHEN is_head=1 AND is_married=1 AND is_owner=1 THEN ASECWT ELSE 0 END) AS married_owner,
-        SUM(CASE WHEN is_head=1 AND is_married=1 AND is_owner=0 THEN ASECWT ELSE 0 END) AS married_renter,
-        SUM(CASE WHEN is_head=1 AND is_married=0 AND is_owner=1 THEN ASECWT ELSE 0 END) AS single_owner,
-        SUM(CASE WHEN is_head=1 AND is_married=0 AND is_owner=0 THEN ASECWT ELSE 0 END) AS single_renter
-    FROM persons WHERE generation IS NOT NULL
-    GROUP BY generation ORDER BY generation
-    """
-    return con.execute(q).df()
+# plotly >= 6.1 with Kaleido >= 1.0 renders a list of figures in one Kaleido
+# session (pio.write_images); under Kaleido 1.x each write_image call starts
+# its own browser. Older versions get one write_image per figure.
+try:
+    BATCH_EXPORT = hasattr(pio, 'write_images') and int(version('kaleido').split('.')[0]) >= 1
+except PackageNotFoundError:
+    BATCH_EXPORT = False
+
+con = connect()
 
 
 def build_sankey_for_gen(df_row, x_offset=0, color='blue'):
@@ -128,13 +108,12 @@ fig = make_subplots(
 )
 
 ages = [30, 35, 40]
+# One cached query for all ages, shared by the combined and single-age figures
+data = sankey_flows(con, ages)
 
 for row_idx, age in enumerate(ages):
-    df = get_sankey_data(age)
-
     for col_idx, (gen, color) in enumerate([('Boomer', 'cream'), ('Millennial', 'blue')]):
-        gen_data = df[df['generation'] == gen].iloc[0]
-        nodes, links = build_sankey_for_gen(gen_data, color=color)
+        nodes, links = build_sankey_for_gen(data[age][gen], color=color)
 
         fig.add_trace(
             go.Sankey(
@@ -176,15 +155,13 @@ fig.update_layout(
 for annotation in fig['layout']['annotations']:
     annotation['font'] = dict(size=14, color=BLACK, family="ABC Oracle Edu")
 
-fig.write_image(f'{OUT}/sankey_three_ages.png', scale=2)
-fig.write_image(f'{OUT}/sankey_three_ages.svg')
+# Static images are collected as (figure, path, scale) and exported together
+# at the end; None keeps plotly's default scale
+images = [(fig, f'{OUT}/sankey_three_ages.png', 2), (fig, f'{OUT}/sankey_three_ages.svg', None)]
 fig.write_html(f'{OUT}/sankey_three_ages.html')
-print("Saved sankey_three_ages.png, .svg, and .html")
 
 # Also save individual ages as separate files
 for age in ages:
-    df = get_sankey_data(age)
-
     fig_single = make_subplots(
         rows=1, cols=2,
         specs=[[{"type": "sankey"}, {"type": "sankey"}]],
@@ -193,8 +170,7 @@ for age in ages:
     )
 
     for col_idx, (gen, color) in enumerate([('Boomer', 'cream'), ('Millennial', 'blue')]):
-        gen_data = df[df['generation'] == gen].iloc[0]
-        nodes, links = build_sankey_for_gen(gen_data, color=color)
+        nodes, links = build_sankey_for_gen(data[age][gen], color=color)
 
         fig_single.add_trace(
             go.Sankey(
@@ -234,6 +210,16 @@ for age in ages:
     for annotation in fig_single['layout']['annotations']:
         annotation['font'] = dict(size=14, color=BLACK, family="ABC Oracle Edu")
 
-    fig_single.write_image(f'{OUT}/sankey_age_{age}.png', scale=2)
+    images.append((fig_single, f'{OUT}/sankey_age_{age}.png', 2))
     fig_single.write_html(f'{OUT}/sankey_age_{age}.html')
+
+# ── Export ──
+if BATCH_EXPORT:
+    figs, paths, scales = zip(*images)
+    pio.write_images(fig=list(figs), file=list(paths), scale=list(scales))
+else:
+    for f, path, scale in images:
+        f.write_image(path, scale=scale)
+print("Saved sankey_three_ages.png, .svg, and .html")
+for age in ages:
     print(f"Saved sankey_age_{age}.png and .html")
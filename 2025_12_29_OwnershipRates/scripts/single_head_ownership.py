@@ -54,6 +54,7 @@ for gen, color, label in [('Boomer', BOOMER_COLOR, 'Boomers'), ('Millennial', BL
     g = df[df['generation'] == gen].sort_values('AGE')
     ax.plot(g['AGE'], g['ownership_single_heads'], color=color, linewidth=3.0, label=label, zorder=3)
 
+marker_xs, marker_ys, marker_cs = [], [], []
 for age in [30, 35, 40]:
     ax.axvline(x=age, color=BLACK, linestyle=':', linewidth=0.8, alpha=0.3, zorder=1)
 
@@ -64,10 +65,9 @@ for age in [30, 35, 40]:
         bv, mv = bv[0], mv[0]
         gap = bv - mv
 
-        ax.plot(age, bv, 'o', color=BOOMER_COLOR, markersize=6, zorder=4,
-                markeredgecolor='white', markeredgewidth=1.5)
-        ax.plot(age, mv, 'o', color=BLUE, markersize=6, zorder=4,
-                markeredgecolor='white', markeredgewidth=1.5)
+        marker_xs += [age, age]
+        marker_ys += [bv, mv]
+        marker_cs += [BOOMER_COLOR, BLUE]
 
         # Gap line and label
         ax.plot([age, age], [mv + 0.5, bv - 0.5], color=BLACK, linewidth=1.8,
@@ -90,6 +90,8 @@ for age in [30, 35, 40]:
                     fontsize=10, color=BLUE, fontweight='bold',
                     ha='right', va='top', zorder=5)
 
+ax.scatter(marker_xs, marker_ys, c=marker_cs, s=36, edgecolors='white', linewidths=1.5, zorder=4)
+
 ax.set_ylim(0, 90)
 yticks = [0, 20, 40, 60, 80]
 ax.set_yticks(yticks)
@@ -88,6 +88,7 @@ for i, (col, title, subtitle) in enumerate(charts):
         ax.plot(g['AGE'], g[col], color=color, linewidth=3.0, label=label, zorder=3)
 
     # Vertical lines at 30, 35, 40 with gap annotations
+    marker_xs, marker_ys, marker_cs = [], [], []
     for age in [30, 35, 40]:
         # Full-height vertical line
         ax.axvline(x=age, color=BLACK, linestyle=':', linewidth=0.8, alpha=0.25, zorder=1)
@@ -100,11 +101,10 @@ for i, (col, title, subtitle) in enumerate(charts):
             mv = mill_val[0]
             gap = bv - mv
 
-            # Dots on lines
-            ax.plot(age, bv, 'o', color=BOOMER_COLOR, markersize=6, zorder=4,
-                    markeredgecolor='white', markeredgewidth=1.5)
-            ax.plot(age, mv, 'o', color=BLUE, markersize=6, zorder=4,
-                    markeredgecolor='white', markeredgewidth=1.5)
+            # Dots on lines (drawn as one scatter after the loop)
+            marker_xs += [age, age]
+            marker_ys += [bv, mv]
+            marker_cs += [BOOMER_COLOR, BLUE]
 
             # Vertical gap line between the two values
             ax.plot([age, age], [mv + 1, bv - 1], color=BLACK, linewidth=1.8,
@@ -132,6 +132,8 @@ for i, (col, title, subtitle) in enumerate(charts):
                         fontsize=10, color=BLUE, fontweight='bold',
                         ha='right', va='top', zorder=5)
 
+    ax.scatter(marker_xs, marker_ys, c=marker_cs, s=36, edgecolors='white', linewidths=1.5, zorder=4)
+
     # Y-axis
     ax.set_ylim(0, 90)
     yticks = [0, 20, 40, 60, 80]
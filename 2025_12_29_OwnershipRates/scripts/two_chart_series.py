@@ -91,6 +91,7 @@ def make_chart(df, col, title, subtitle, filename):
         ax.plot(g['AGE'], g[col], color=color, linewidth=3.0, label=label, zorder=3)
 
     # Vertical dotted lines and annotations at 30, 35, 40
+    marker_xs, marker_ys, marker_cs = [], [], []
     for age in [30, 35, 40]:
         ax.axvline(x=age, color=BLACK, linestyle=':', linewidth=0.8, alpha=0.3, zorder=1)
 
@@ -115,8 +116,9 @@ def make_chart(df, col, title, subtitle, filename):
             for gen, color, offset_y in [('Boomer', BOOMER_COLOR, boomer_offset),
                                           ('Millennial', BLUE, mill_offset)]:
                 val = vals[gen]
-                ax.plot(age, val, 'o', color=color, markersize=6, zorder=4,
-                        markeredgecolor='white', markeredgewidth=1.5)
+                marker_xs.append(age)
+                marker_ys.append(val)
+                marker_cs.append(color)
                 ax.annotate(f'{val:.0f}%',
                             xy=(age, val),
                             xytext=(4, offset_y),
@@ -124,6 +126,8 @@ def make_chart(df, col, title, subtitle, filename):
                             fontsize=10, fontweight='bold', color=color,
                             zorder=5)
 
+    ax.scatter(marker_xs, marker_ys, c=marker_cs, s=36, edgecolors='white', linewidths=1.5, zorder=4)
+
     # Y-axis formatting
     ymin, ymax = ax.get_ylim()
     ax.set_ylim(max(0, ymin - 3), min(100, ymax + 5))